@@ -1,18 +1,58 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langchain_core.utils.json import parse_partial_json
 from langgraph.graph import StateGraph, MessagesState, START, END
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.config import get_stream_writer
 from typing_extensions import Annotated, TypedDict
 import uuid
+import hashlib
+import functools
 import os
+import re
+import json
+import random
+import threading
+import weakref
 from dotenv import load_dotenv
+from checkpointer import make_checkpointer
+from sentences import SentenceBuffer, split_sentences
+from resilience import CallPolicy
+from llm_providers import make_chat_model
+import metrics
 
 # Load environment variables
 load_dotenv()
 
+# Fold answered questions into compact records instead of resending the full history
+COMPACT_HISTORY = os.getenv("COMPACT_HISTORY", "0") == "1"
+COMPACT_ANSWER_WORDS = int(os.getenv("COMPACT_ANSWER_WORDS", "40"))
+# Share of compacted turns that also count full vs. compacted prompt tokens;
+# counting tokenizes both prompts, so it is kept off most turns
+COMPACT_METRICS_SAMPLE_RATE = float(os.getenv("COMPACT_METRICS_SAMPLE_RATE", "0.1"))
+
+# "llm" lets the model drive the whole interview; "sequenced" walks a fixed
+# question list and only asks the model to judge each answer
+SCREENING_ENGINE = os.getenv("SCREENING_ENGINE", "llm")
+MAX_CLARIFICATIONS = int(os.getenv("MAX_CLARIFICATIONS", "1"))
+SCREENING_MODEL = os.getenv("SCREENING_MODEL", "gpt-4o")
+# "openai" for the hosted model, "scripted" for the offline rule-based stand-in
+SCREENING_LLM_PROVIDER = os.getenv("SCREENING_LLM_PROVIDER", "openai")
+SCRIPTED_LLM_LATENCY = float(os.getenv("SCRIPTED_LLM_LATENCY", "0"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "20"))
+
+
+def _add_usage(left, right):
+    """Reducer that accumulates token usage across LLM calls in an interview."""
+    merged = dict(left or {})
+    for key, value in (right or {}).items():
+        merged[key] = merged.get(key, 0) + value
+    return merged
+
 
 class ScreeningState(MessagesState): 
     control: dict
+    records: list
+    usage: Annotated[dict, _add_usage]
 
 
 class ScreeningFlowControl(TypedDict):
@@ -32,15 +72,113 @@ class ScreeningFlowControl(TypedDict):
     ]
 
 
-# Initialize LLM
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
-llm = ChatOpenAI(model='gpt-4o', api_key=api_key, temperature=0)
+class AnswerJudgement(TypedDict):
+    """
+    Schema for judging a single candidate answer in the sequenced engine.
+    """
+
+    verdict: Annotated[
+        str,
+        "Either 'adequate', 'clarify' or 'counter_question'. Use 'counter_question' if the candidate asked the interviewer a question instead of answering; 'clarify' if the answer is vague or incomplete for this kind of question; otherwise 'adequate'."
+    ]
+
 
-Screening_llm = llm.with_structured_output(ScreeningFlowControl)
+# Interview templates, used by the sequenced engine and the scripted provider
+# (same wording the free-form prompt asks for)
+SCREENING_QUESTIONS = [
+    {"id": "relocation", "kind": "yes/no", "text": "Are you open to relocating to Bangalore?"},
+    {"id": "compensation", "kind": "compensation", "text": "What is your expected compensation range?"},
+    {"id": "motivation", "kind": "motivation", "text": "Why do you want to join Sigmoid?"},
+    {"id": "team_lead", "kind": "yes/no", "text": "Have you led a team before?"},
+    {"id": "experience", "kind": "experience", "text": "Could you tell me about your professional experience and the kind of work you have done in past roles?"},
+    {"id": "reason_for_leaving", "kind": "motivation", "text": "Why are you leaving your current organization?"},
+]
+GREETING = "Hi there! Thank you for taking the time to speak with me today."
+ACKNOWLEDGEMENTS = ["Thank you for sharing that.", "I appreciate the clarity.", "Thanks for explaining."]
+CLARIFICATION = "Could you please share a bit more so I can understand better?"
+REFUSAL = "I'm sorry, I’m not able to answer questions during this round. This is a short screening interview, and I need your responses to the questions I’m asking."
+CLOSING = "Thank you very much for your time today. We truly appreciate your interest in Sigmoid. If your profile is shortlisted based on this conversation, our HR team will reach out to you."
+
+
+def template_replies():
+    """
+    Every reply the sequenced engine can produce, e.g. for pre-synthesizing speech.
 
-# System prompt
+    Returns:
+        list: Reply texts, without duplicates.
+    """
+    replies = [f"{GREETING} {SCREENING_QUESTIONS[0]['text']}", CLARIFICATION, CLOSING]
+    replies += [f"{REFUSAL} {question['text']}" for question in SCREENING_QUESTIONS]
+    replies += [f"{ACKNOWLEDGEMENTS[cursor % len(ACKNOWLEDGEMENTS)]} {SCREENING_QUESTIONS[cursor]['text']}"
+                for cursor in range(1, len(SCREENING_QUESTIONS))]
+    return list(dict.fromkeys(replies))
+
+
+def _scripted_flow(messages):
+    """Rule-based ScreeningFlowControl used by the scripted provider."""
+    # Skip the system prompt, which quotes the first question verbatim
+    asked = " ".join(str(message.content) for message in messages[1:] if not isinstance(message, HumanMessage))
+    # With history compaction, earlier questions only appear as record ids
+    pending = [question for question in SCREENING_QUESTIONS
+               if question["text"] not in asked and f"\n{question['id']}: " not in asked]
+    if len(pending) == len(SCREENING_QUESTIONS):
+        return {"whether_to_continue": "continue", "next_question": f"{GREETING} {pending[0]['text']}"}
+
+    if str(messages[-1].content).strip().endswith("?"):
+        current = SCREENING_QUESTIONS[len(SCREENING_QUESTIONS) - len(pending) - 1]
+        return {"whether_to_continue": "continue", "next_question": f"{REFUSAL} {current['text']}"}
+    if not pending:
+        return {"whether_to_continue": "stop", "next_question": CLOSING}
+    acknowledgement = ACKNOWLEDGEMENTS[len(pending) % len(ACKNOWLEDGEMENTS)]
+    return {"whether_to_continue": "continue", "next_question": f"{acknowledgement} {pending[0]['text']}"}
+
+
+def _scripted_judgement(messages):
+    """Rule-based AnswerJudgement used by the scripted provider."""
+    question, _, answer = str(messages[-1].content).partition("\nAnswer: ")
+    if answer.strip().endswith("?"):
+        return {"verdict": "counter_question"}
+    short_ok = "(yes/no)" in question or "(compensation)" in question
+    if not short_ok and len(answer.split()) < 3:
+        return {"verdict": "clarify"}
+    return {"verdict": "adequate"}
+
+
+llm_policy = CallPolicy("llm", timeout=LLM_TIMEOUT)
+
+
+@functools.lru_cache(maxsize=1)
+def get_llm():
+    """Build the screening chat model on first use (keeps imports and cold start cheap)."""
+    return make_chat_model(
+        SCREENING_LLM_PROVIDER,
+        model=SCREENING_MODEL,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        timeout=LLM_TIMEOUT,
+        responders={"ScreeningFlowControl": _scripted_flow, "AnswerJudgement": _scripted_judgement},
+        latency=SCRIPTED_LLM_LATENCY,
+    )
+
+
+# include_raw keeps the AIMessage so token usage (incl. cached tokens) can be read
+@functools.lru_cache(maxsize=1)
+def screening_llm():
+    return get_llm().with_structured_output(ScreeningFlowControl, include_raw=True)
+
+
+@functools.lru_cache(maxsize=1)
+def judge_llm():
+    return get_llm().with_structured_output(AnswerJudgement, include_raw=True)
+
+
+# Same schema as a forced tool call, for streaming the arguments token by token
+@functools.lru_cache(maxsize=1)
+def streaming_screening_llm():
+    return get_llm().bind_tools([ScreeningFlowControl], tool_choice="ScreeningFlowControl")
+
+
+# System prompt. It is always sent first and never templated, so the request
+# prefix stays byte-identical across turns and hits OpenAI's prompt cache.
 ai_prompt = SystemMessage(content="""
 You are a polite, professional screening assistant conducting a structured pre-interview 
 for candidates interested in joining Sigmoid. 
@@ -139,53 +277,494 @@ Follow these rules strictly:
 
 
 
-def remote_graph(state: ScreeningState):
+# Phrases the prompt prescribes for clarification requests
+_CLARIFICATION_PATTERN = re.compile(r"share a bit more|elaborate|more detail", re.IGNORECASE)
+
+
+def _shorten(text, max_words):
+    words = text.split()
+    if len(words) <= max_words:
+        return text.strip()
+    return " ".join(words[:max_words]) + " …"
+
+
+def _keywords(text):
+    return {word.strip(".,!?;:\"'").lower() for word in text.split() if len(word) > 3}
+
+
+def _question_id(text, previous):
+    """
+    Id (from SCREENING_QUESTIONS) of the question an AI turn asks.
+
+    Clarification requests belong to the previous question; paraphrased
+    questions go to the template sharing the most words with them.
+    """
+    if previous and _CLARIFICATION_PATTERN.search(text):
+        return previous
+    for question in SCREENING_QUESTIONS:
+        if question["text"] in text:
+            return question["id"]
+    words = _keywords(text)
+    best = max(SCREENING_QUESTIONS, key=lambda question: len(words & _keywords(question["text"])))
+    if words & _keywords(best["text"]):
+        return best["id"]
+    ids = [question["id"] for question in SCREENING_QUESTIONS]
+    return ids[min(ids.index(previous) + 1, len(ids) - 1)] if previous in ids else ids[0]
+
+
+def compact_history(state: ScreeningState):
+    """Fold every answered exchange (except the in-flight one) into a compact record."""
+    records = list(state.get("records") or [])
+    messages = state["messages"]
+    ai_indices = [i for i, message in enumerate(messages) if isinstance(message, AIMessage)]
+
+    # The last AI question and the answer to it are the in-flight exchange
+    for i in ai_indices[len(records):-1]:
+        if i + 1 >= len(messages):
+            break
+        question = messages[i].content
+        records.append({
+            "id": _question_id(question, records[-1]["id"] if records else None),
+            "answer": _shorten(messages[i + 1].content, COMPACT_ANSWER_WORDS),
+            "clarification": bool(_CLARIFICATION_PATTERN.search(question)),
+        })
+
+    return {"records": records}
+
+
+# Fixed header of the records message; records are only ever appended below it,
+# so the summary of earlier turns stays a cacheable prefix of the next request
+_RECORDS_HEADER = "Earlier answers (question_id: answer; id+ answers a clarification):"
+
+
+def _record_line(record):
+    return f"{record['id']}{'+' if record['clarification'] else ''}: {record['answer']}"
+
+
+def _build_prompt(state: ScreeningState):
+    """Build the message list sent to the screening LLM."""
+    full_prompt = [ai_prompt] + state["messages"]
+    records = state.get("records") or []
+    if not COMPACT_HISTORY or not records:
+        return full_prompt
+
+    # Earlier exchanges are sent as records; only the in-flight exchange is verbatim
+    messages = state["messages"]
+    last_ai = max(i for i, message in enumerate(messages) if isinstance(message, AIMessage))
+    summary = SystemMessage(content="\n".join([_RECORDS_HEADER] + [_record_line(record) for record in records]))
+    compacted_prompt = [ai_prompt, summary] + messages[last_ai:]
+
+    if random.random() < COMPACT_METRICS_SAMPLE_RATE:
+        metrics.record("agent.input_tokens.full", get_llm().get_num_tokens_from_messages(full_prompt))
+        metrics.record("agent.input_tokens.compacted", get_llm().get_num_tokens_from_messages(compacted_prompt))
+    return compacted_prompt
+
+
+def _usage_of(raw):
+    """Extract fresh vs. cached input tokens from an AIMessage's usage metadata."""
+    usage = getattr(raw, "usage_metadata", None) or {}
+    input_tokens = usage.get("input_tokens", 0)
+    cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+    metrics.record("agent.cached_tokens", cached_tokens)
+    metrics.record("agent.fresh_input_tokens", input_tokens - cached_tokens)
+    return {"calls": 1, "input_tokens": input_tokens, "cached_tokens": cached_tokens}
+
+
+def _invoke_structured(runnable, messages):
+    """
+    Invoke a structured-output runnable and return (parsed, usage).
+    """
+    response = llm_policy.call(runnable.invoke, messages)
+    if response.get("parsing_error"):
+        raise response["parsing_error"]
+    return response["parsed"], _usage_of(response["raw"])
+
+
+async def _ainvoke_structured(runnable, messages):
+    """
+    Async variant of _invoke_structured, using the async OpenAI client.
+    """
+    response = await llm_policy.acall(runnable.ainvoke, messages)
+    if response.get("parsing_error"):
+        raise response["parsing_error"]
+    return response["parsed"], _usage_of(response["raw"])
+
+
+def _stream_structured(messages):
+    """
+    Stream the screening decision, writing each completed sentence of
+    next_question to the graph's custom stream as soon as it closes.
+
+    Returns:
+        tuple: (parsed, usage) like _invoke_structured.
+    """
+    write = get_stream_writer()
+    buffer = SentenceBuffer()
+    gathered = None
+    for chunk in streaming_screening_llm().stream(messages):
+        gathered = chunk if gathered is None else gathered + chunk
+        if not gathered.tool_call_chunks:
+            continue
+        partial = parse_partial_json(gathered.tool_call_chunks[0]["args"] or "{}") or {}
+        for sentence in buffer.update(partial.get("next_question") or ""):
+            write({"sentence": sentence})
+
+    for sentence in buffer.flush():
+        write({"sentence": sentence})
+    parsed = json.loads(gathered.tool_call_chunks[0]["args"])
+    return parsed, _usage_of(gathered)
+
+
+def remote_graph(state: ScreeningState, config: RunnableConfig):
     """Process messages through the LLM."""
     
-    response = Screening_llm.invoke([ai_prompt] + state["messages"])
+    if config["configurable"].get("stream_sentences"):
+        # Sentences already handed to TTS cannot be taken back, so no retries or hedges
+        response, usage = llm_policy.call(_stream_structured, _build_prompt(state), idempotent=False)
+    else:
+        response, usage = _invoke_structured(screening_llm(), _build_prompt(state))
+    
+    return {"messages": AIMessage(response['next_question']), "control": {"decision": response['whether_to_continue']}, "usage": usage}
+
+
+async def aremote_graph(state: ScreeningState):
+    """Async variant of remote_graph (sentence streaming is sync-only)."""
+    response, usage = await _ainvoke_structured(screening_llm(), _build_prompt(state))
+    return {"messages": AIMessage(response['next_question']), "control": {"decision": response['whether_to_continue']}, "usage": usage}
+
+
+judge_prompt = SystemMessage(content="""
+You judge one answer in a structured screening interview for Sigmoid.
+Return 'counter_question' if the candidate asked the interviewer something instead of answering.
+Return 'clarify' only if the answer does not meaningfully address the question:
+- yes/no questions: "Yes" or "No" is enough; clarify "Sometimes", "Kind of", "Maybe".
+- compensation/relocation: short answers are fine; clarify "Decent amount", "Maybe Bangalore".
+- motivation: clarify one-word or empty reasons ("Growth", "Money", "Not sure").
+- experience: clarify answers without substance ("General stuff", "Many things").
+Otherwise return 'adequate'.
+""")
+
+
+def _judge_messages(question, answer):
+    return [
+        judge_prompt,
+        HumanMessage(content=f"Question ({question['kind']}): {question['text']}\nAnswer: {answer}"),
+    ]
+
+
+def judge_answer(question, answer):
+    """
+    Ask the LLM whether an answer is adequate, vague, or a counter-question.
+
+    Args:
+        question (dict): Entry from SCREENING_QUESTIONS.
+        answer (str): Everything the candidate has said for this question.
+
+    Returns:
+        tuple: (verdict, usage) where verdict is 'adequate', 'clarify' or 'counter_question'.
+    """
+    response, usage = _invoke_structured(judge_llm(), _judge_messages(question, answer))
+    return response['verdict'], usage
+
+
+async def ajudge_answer(question, answer):
+    """Async variant of judge_answer."""
+    response, usage = await _ainvoke_structured(judge_llm(), _judge_messages(question, answer))
+    return response['verdict'], usage
+
+
+def _pending_answer(state: ScreeningState):
+    """Return the current question and everything said for it so far."""
+    control = state["control"]
+    latest = state["messages"][-1].content
+    return SCREENING_QUESTIONS[control["cursor"]], f"{control['answer']} {latest}".strip()
+
+
+def _opening_turn():
+    """First turn: greet and ask the first question without calling the LLM."""
+    reply = f"{GREETING} {SCREENING_QUESTIONS[0]['text']}"
+    control = {"decision": "continue", "cursor": 0, "clarifications": 0, "answer": ""}
+    return {"messages": AIMessage(reply), "control": control}
+
+
+def _closed_turn(control):
+    """The interview is already over: repeat the closing line without calling the LLM."""
+    return {"messages": AIMessage(CLOSING), "control": {**control, "decision": "stop"}}
+
+
+def _advance(control, question, answer, verdict, usage):
+    """Apply the judge's verdict to the question cursor and render the reply."""
+    cursor = control["cursor"]
+    if verdict == "counter_question":
+        reply = f"{REFUSAL} {question['text']}"
+    elif verdict == "clarify" and control["clarifications"] < MAX_CLARIFICATIONS:
+        reply = CLARIFICATION
+        control = {**control, "clarifications": control["clarifications"] + 1, "answer": answer}
+    elif cursor + 1 >= len(SCREENING_QUESTIONS):
+        reply = CLOSING
+        control = {"decision": "stop", "cursor": cursor + 1, "clarifications": 0, "answer": ""}
+    else:
+        cursor += 1
+        reply = f"{ACKNOWLEDGEMENTS[cursor % len(ACKNOWLEDGEMENTS)]} {SCREENING_QUESTIONS[cursor]['text']}"
+        control = {"decision": "continue", "cursor": cursor, "clarifications": 0, "answer": ""}
+
+    return {"messages": AIMessage(reply), "control": control, "usage": usage}
+
+
+def sequenced_turn(state: ScreeningState):
+    """Advance the question cursor one step and render the reply from templates."""
+    if "cursor" not in (state.get("control") or {}):
+        return _opening_turn()
+    if state["control"]["decision"] == "stop":
+        return _closed_turn(state["control"])
+    question, answer = _pending_answer(state)
+    verdict, usage = judge_answer(question, answer)
+    return _advance(state["control"], question, answer, verdict, usage)
+
+
+async def asequenced_turn(state: ScreeningState):
+    """Async variant of sequenced_turn."""
+    if "cursor" not in (state.get("control") or {}):
+        return _opening_turn()
+    if state["control"]["decision"] == "stop":
+        return _closed_turn(state["control"])
+    question, answer = _pending_answer(state)
+    verdict, usage = await ajudge_answer(question, answer)
+    return _advance(state["control"], question, answer, verdict, usage)
+
+
+def _build_graph(checkpointer=None):
+    builder = StateGraph(ScreeningState)
+    if SCREENING_ENGINE == "sequenced":
+        builder.add_node("sequenced_turn", RunnableLambda(sequenced_turn, afunc=asequenced_turn))
+        builder.add_edge(START, "sequenced_turn")
+        builder.add_edge("sequenced_turn", END)
+    else:
+        builder.add_node("remote_graph", RunnableLambda(remote_graph, afunc=aremote_graph))
+        if COMPACT_HISTORY:
+            builder.add_node("compact_history", compact_history)
+            builder.add_edge(START, "compact_history")
+            builder.add_edge("compact_history", "remote_graph")
+        else:
+            builder.add_edge(START, "remote_graph")
+        builder.add_edge("remote_graph", END)
+    return builder.compile(checkpointer=checkpointer or make_checkpointer())
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_graph():
+    """
+    Compile the screening graph on first use.
+    The lock makes sure every session shares one graph (and one checkpointer).
+    """
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = _build_graph()
+    return _graph
+
+
+# Node whose output the precomputed greeting stands in for
+REPLY_NODE = "sequenced_turn" if SCREENING_ENGINE == "sequenced" else "remote_graph"
+
+
+class InterviewSession:
+    """
+    Handle for one candidate's interview.
+    Each session owns its own LangGraph thread, so histories never mix.
+    """
+
+    def __init__(self, thread_id=None):
+        self.thread_id = thread_id or str(uuid.uuid4())
+        self.config = {"configurable": {"thread_id": self.thread_id}}
+
+
+class SessionManager:
+    """
+    Registry of live interview sessions.
+    The lock only guards the registry itself; turns on different sessions
+    run concurrently since each one targets its own checkpoint thread.
+
+    Entries are weak: a session leaves the registry as soon as nothing else
+    holds it, e.g. once Streamlit drops the state of a closed browser tab.
+    """
+
+    def __init__(self):
+        self._sessions = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def create(self):
+        session = InterviewSession()
+        with self._lock:
+            self._sessions[session.thread_id] = session
+        return session
+
+    def end(self, session):
+        with self._lock:
+            self._sessions.pop(session.thread_id, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+sessions = SessionManager()
+
+
+def _turn_input(text):
+    return {"messages": [HumanMessage(content=text)]}
+
+
+def _turn_output(response):
+    return response['messages'][-1].content, response['control']['decision']
+
+
+def greeting_fingerprint():
+    """
+    Identify everything the opening turn depends on (prompt, provider, model, engine).
     
-    return {"messages": AIMessage(response['next_question']), "control": response['whether_to_continue']}
+    Returns:
+        str: Hex digest that changes whenever the greeting must be regenerated.
+    """
+    key = "\0".join([ai_prompt.content, SCREENING_LLM_PROVIDER, SCREENING_MODEL, SCREENING_ENGINE, GREETING, SCREENING_QUESTIONS[0]["text"]])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
 
+@functools.lru_cache(maxsize=4)
+def _greeting_for(fingerprint):
+    if SCREENING_ENGINE == "sequenced":
+        update = _opening_turn()
+        return update["messages"].content, update["control"]
+    response, _ = _invoke_structured(screening_llm(), [ai_prompt, HumanMessage(content='Hi')])
+    return response['next_question'], {"decision": response['whether_to_continue']}
 
-# Build the graph
-builder = StateGraph(ScreeningState)
-builder.add_node("remote_graph", remote_graph)
-builder.add_edge(START, "remote_graph")
-builder.add_edge("remote_graph", END)
 
-memory = MemorySaver()
-graph = builder.compile(checkpointer=memory)
+def greeting():
+    """
+    Return the opening turn, generated once per prompt/model version.
+    
+    Returns:
+        tuple: (greeting_text, control)
+    """
+    return _greeting_for(greeting_fingerprint())
 
-# Initialize thread_id and config (will be used across the session)
-thread_id = str(uuid.uuid4())
-config = {"configurable": {"thread_id": thread_id}}
 
+def _seed_greeting(session):
+    text, control = greeting()
+    values = {"messages": [HumanMessage(content='Hi'), AIMessage(text)], "control": control}
+    return values, text, control["decision"]
 
-def start_interview():
+
+def start_interview(session):
     """
-    Start the interview by sending 'Hi' to the agent.
+    Start the interview by seeding the session with the cached greeting turn.
     
+    Args:
+        session (InterviewSession): The candidate's interview session.
+        
     Returns:
         tuple: (response_text, control_decision)
     """
-    input_msg = 'Hi'
-    response = graph.invoke({"messages": [HumanMessage(content=input_msg)]}, config=config)
-    output = response['messages'][-1].content
-    decision = response['control']
-    return output, decision
+    values, text, decision = _seed_greeting(session)
+    get_graph().update_state(session.config, values, as_node=REPLY_NODE)
+    return text, decision
 
 
-def process_with_agent(transcribed_text):
+def process_with_agent(session, transcribed_text):
     """
     Process transcribed text through the LangGraph agent.
     
     Args:
+        session (InterviewSession): The candidate's interview session.
         transcribed_text (str): The transcribed audio text.
         
     Returns:
         tuple: (response_text, control_decision)
     """
-    response = graph.invoke({"messages": [HumanMessage(content=transcribed_text)]}, config=config)
-    output = response['messages'][-1].content
-    decision = response['control']
-    return output, decision
+    return _turn_output(get_graph().invoke(_turn_input(transcribed_text), config=session.config))
+
+
+async def astart_interview(session):
+    """
+    Async variant of start_interview.
+    
+    Args:
+        session (InterviewSession): The candidate's interview session.
+        
+    Returns:
+        tuple: (response_text, control_decision)
+    """
+    values, text, decision = _seed_greeting(session)
+    await get_graph().aupdate_state(session.config, values, as_node=REPLY_NODE)
+    return text, decision
+
+
+async def aprocess_with_agent(session, transcribed_text):
+    """
+    Async variant of process_with_agent, built on graph.ainvoke.
+    
+    Args:
+        session (InterviewSession): The candidate's interview session.
+        transcribed_text (str): The transcribed audio text.
+        
+    Returns:
+        tuple: (response_text, control_decision)
+    """
+    return _turn_output(await get_graph().ainvoke(_turn_input(transcribed_text), config=session.config))
+
+
+def stream_with_agent(session, transcribed_text):
+    """
+    Process transcribed text through the agent, yielding the reply sentence
+    by sentence as the LLM generates it.
+    
+    Args:
+        session (InterviewSession): The candidate's interview session.
+        transcribed_text (str): The transcribed audio text.
+        
+    Yields:
+        tuple: ("sentence", text) for each completed sentence, then
+        ("done", (response_text, control_decision)).
+    """
+    config = {"configurable": {**session.config["configurable"], "stream_sentences": True}}
+    streamed = False
+    response = None
+    for mode, chunk in get_graph().stream(_turn_input(transcribed_text), config=config,
+                                    stream_mode=["custom", "values"]):
+        if mode == "custom":
+            streamed = True
+            yield "sentence", chunk["sentence"]
+        else:
+            response = chunk
+
+    output, decision = _turn_output(response)
+    # Template-based replies (sequenced engine) are not streamed by the node
+    if not streamed:
+        for sentence in split_sentences(output):
+            yield "sentence", sentence
+    yield "done", (output, decision)
+
+
+def prompt_cache_stats(session):
+    """
+    Report prompt-cache usage for an interview.
+
+    Args:
+        session (InterviewSession): The candidate's interview session.
+
+    Returns:
+        dict: calls, input_tokens, cached_tokens and hit_ratio (cached / input).
+    """
+    usage = get_graph().get_state(session.config).values.get("usage") or {}
+    input_tokens = usage.get("input_tokens", 0)
+    cached_tokens = usage.get("cached_tokens", 0)
+    return {
+        "calls": usage.get("calls", 0),
+        "input_tokens": input_tokens,
+        "cached_tokens": cached_tokens,
+        "hit_ratio": cached_tokens / input_tokens if input_tokens else 0.0,
+    }
@@ -1,363 +1,293 @@
 import streamlit as st
-import sounddevice as sd
+from streamlit import runtime
 import numpy as np
-from scipy.io.wavfile import write
-import tempfile
 import os
 import time
-from transcriber import transcribe_audio
-from agent import process_with_agent, start_interview
-from tts import text_to_speech
+import threading
+from concurrent.futures import Future
+from transcriber import transcribe_audio, StreamingTranscriber
+from vad import Endpointer
+from agent import process_with_agent, start_interview, stream_with_agent, sessions, greeting, greeting_fingerprint, template_replies
+from tts import text_to_speech, submit_speech, speak_sentences, voice_fingerprint, prewarm, TTS_MIME_TYPE
+from scoring import enqueue_transcript
+from audio_store import audio_store
+from transcript_pdf import TranscriptPDF
+import metrics
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
 import io
+import html
 import base64
 import streamlit.components.v1 as components
 
-def get_robo_html(audio_path, autoplay=True):
-    with open(audio_path, "rb") as f:
-        audio_bytes = f.read()
-    audio_base64 = base64.b64encode(audio_bytes).decode()
+# Pace of the chat's word reveal; the TTS voice speaks at roughly this rate
+REVEAL_WORDS_PER_SECOND = float(os.getenv("REVEAL_WORDS_PER_SECOND", "2.6"))
+# Hand each sentence of the reply to TTS while the LLM is still generating it
+STREAM_TTS = os.getenv("STREAM_TTS", "0") == "1"
+# Generate the greeting text and audio when the process starts instead of on first click
+PREWARM_GREETING = os.getenv("PREWARM_GREETING", "1") == "1"
+# Synthesize every template reply into the speech cache when the process starts
+PREWARM_TEMPLATES = os.getenv("PREWARM_TEMPLATES", "0") == "1"
+# Transcribe the answer in segments while the candidate is still speaking
+STREAMING_ASR = os.getenv("STREAMING_ASR", "0") == "1"
+# End the turn automatically when the candidate stops speaking
+AUTO_ENDPOINT = os.getenv("AUTO_ENDPOINT", "1") == "1"
+# How often the page checks for the end of the answer, in seconds
+ENDPOINT_POLL_INTERVAL = 0.2
+# How often the robot panel picks up finished sentences of the reply, in seconds
+SPEECH_POLL_INTERVAL = 0.1
+
+# The robot player is a static custom component: its page loads once and then
+# receives each turn's audio segments as they are synthesized
+_robot_player = components.declare_component(
+    "robot_player", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "robot_player")
+)
+
+def _audio_src(audio, coordinates):
+    """
+    URL the player can fetch a segment from. Audio is registered with Streamlit's
+    media file manager, so the page only carries a short content-addressed URL;
+    the data URI fallback is for bare script runs without a server.
     
-    autoplay_attr = "autoplay" if autoplay else ""
+    Streamlit drops media files that the latest full run did not register, so
+    every run that renders the player registers its segments again; the same
+    content gets the same URL.
+    """
+    if runtime.exists():
+        return runtime.get_instance().media_file_mgr.add(bytes(audio), TTS_MIME_TYPE, coordinates)
+    return f"data:{TTS_MIME_TYPE};base64,{base64.b64encode(audio).decode()}"
+
+def robot_player(turn, message, autoplay=True):
+    """
+    Render the robot and queue the turn's audio segments for gapless playback.
     
-    return f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-    <style>
-        * {{margin:0; padding:0; box-sizing:border-box;}}
-        body {{font-family:'Inter',sans-serif; display:flex; justify-content:center; align-items:center; height:100%; background:transparent; overflow: hidden;}}
-        .container {{background:rgba(255,255,255,0.95); backdrop-filter:blur(10px); border-radius:20px; padding:0.5rem; box-shadow:0 10px 30px rgba(0,0,0,0.1); text-align:center; width:100%;}}
-        .anim-box {{margin:0.5rem 0; position:relative; display:flex; justify-content:center; align-items:center; height:180px;}}
-        .controls {{margin-top:0.5rem;}}
-        .play-btn {{background:linear-gradient(135deg,#1e3c72 0%,#2a5298 100%); color:white; border:none; padding:0.5rem 1.5rem; font-size:0.9rem; font-weight:600; border-radius:50px; cursor:pointer; transition:all 0.3s; box-shadow:0 5px 15px rgba(30,60,114,0.4); font-family:'Inter',sans-serif;}}
-        .play-btn:hover {{transform:translateY(-2px); box-shadow:0 8px 20px rgba(30,60,114,0.6);}}
-        .play-btn.playing {{background:linear-gradient(135deg,#4facfe 0%,#00f2fe 100%);}}
-        .status {{margin-top:0.2rem; color:#666; font-size:0.7rem; font-weight:500;}}
-        .progress-container {{width:100%; height:4px; background:#e0e0e0; border-radius:10px; margin-top:0.5rem; overflow:hidden;}}
-        .progress-bar {{height:100%; background:linear-gradient(90deg,#1e3c72 0%,#2a5298 100%); width:0%; transition:width 0.1s linear; border-radius:10px;}}
-        
-        /* Happy Waving Robot Animation */
-        .robo-container {{position:relative; width:200px; height:220px; display:flex; justify-content:center; transform: scale(0.65); transform-origin: center top;}}
-        
-        /* Head */
-        .robo-head {{
-            width: 180px; height: 160px;
-            background: #dbe7f0; /* Bluish grey */
-            border: 4px solid #1a2530;
-            border-radius: 90px 90px 70px 70px;
-            position: absolute; top: 40px; z-index: 10;
-            box-shadow: inset -10px -10px 20px rgba(0,0,0,0.05);
-        }}
-        
-        /* Face Panel */
-        .face-panel {{
-            width: 140px; height: 90px;
-            background: #e1f5fe; /* Light blue */
-            border: 3px solid #1a2530;
-            border-radius: 40px 40px 30px 30px;
-            position: absolute; top: 45px; left: 50%;
-            transform: translateX(-50%);
-            overflow: hidden;
-        }}
-        
-        /* Forehead Panel */
-        .forehead-panel {{
-            width: 50px; height: 25px;
-            background: #dbe7f0;
-            border: 3px solid #1a2530;
-            border-radius: 5px 5px 0 0;
-            position: absolute; top: 20px; left: 50%;
-            transform: translateX(-50%);
-            z-index: 11;
-        }}
-        
-        /* Ears/Headphones */
-        .ear {{
-            width: 25px; height: 60px;
-            background: #f0f7fa;
-            border: 3px solid #1a2530;
-            border-radius: 15px;
-            position: absolute; top: 90px;
-            z-index: 5;
-        }}
-        .ear.left {{left: 45px;}}
-        .ear.right {{right: 45px;}}
-        
-        /* Eyes (Visible & Blinking) */
-        .eye {{
-            width: 18px; height: 25px;
-            background: #1a2530;
-            border-radius: 50%;
-            position: absolute; top: 25px;
-            animation: blink 4s infinite;
-        }}
-        .eye.left {{left: 35px;}}
-        .eye.right {{right: 35px;}}
-        
-        .eye::after {{
-            content: '';
-            width: 6px; height: 6px;
-            background: white;
-            border-radius: 50%;
-            position: absolute; top: 5px; left: 4px;
-        }}
-        
-        @keyframes blink {{
-            0%, 48%, 52%, 100% {{transform: scaleY(1);}}
-            50% {{transform: scaleY(0.1);}}
-        }}
-        
-        /* Cheeks */
-        .cheek {{
-            width: 20px; height: 10px;
-            background: #ff7e7e;
-            border-radius: 50%;
-            position: absolute; top: 55px;
-            opacity: 0.6;
-        }}
-        .cheek.left {{left: 25px;}}
-        .cheek.right {{right: 25px;}}
-        
-        /* Mouth (Realistic Speaking) */
-        .mouth {{
-            width: 30px; height: 15px;
-            background: #1a2530;
-            border-radius: 0 0 30px 30px;
-            position: absolute; top: 60px; left: 50%;
-            transform: translateX(-50%);
-            transition: all 0.1s;
-            overflow: hidden;
-        }}
-        .mouth::after {{
-            content: '';
-            width: 20px; height: 8px;
-            background: #ff7e7e;
-            border-radius: 50%;
-            position: absolute; bottom: -4px; left: 50%;
-            transform: translateX(-50%);
-        }}
-        
-        .mouth.speaking {{
-            animation: speak-real 0.2s infinite alternate;
-        }}
-        
-        @keyframes speak-real {{
-            0% {{height: 10px; border-radius: 5px;}}
-            100% {{height: 25px; border-radius: 0 0 20px 20px;}}
-        }}
-        
-        /* Body */
-        .body {{
-            width: 120px; height: 100px;
-            background: #dbe7f0;
-            border: 4px solid #1a2530;
-            border-radius: 30px 30px 50px 50px;
-            position: absolute; top: 190px; left: 50%;
-            transform: translateX(-50%);
-            z-index: 9;
-        }}
-        
-        /* Chest Panel */
-        .chest-panel {{
-            width: 70px; height: 50px;
-            background: #c3d0d9;
-            border: 3px solid #1a2530;
-            border-radius: 15px;
-            position: absolute; top: 25px; left: 50%;
-            transform: translateX(-50%);
-        }}
-        
-        /* Neck */
-        .neck {{
-            width: 60px; height: 20px;
-            background: #1a2530;
-            position: absolute; top: 180px; left: 50%;
-            transform: translateX(-50%);
-            z-index: 8;
-        }}
-        
-        /* Arms */
-        .arm {{
-            width: 25px; height: 70px;
-            background: #dbe7f0;
-            border: 3px solid #1a2530;
-            border-radius: 15px;
-            position: absolute; top: 200px;
-            z-index: 8;
-        }}
-        .arm.left {{
-            left: 70px;
-            transform-origin: top center;
-            transform: rotate(20deg);
-        }}
-        .arm.right {{
-            right: 70px;
-            transform: rotate(-20deg);
-        }}
-        
-        /* Waving Hand */
-        .hand-container {{
-            position: absolute;
-            top: 140px; left: 30px;
-            z-index: 20;
-            transform-origin: bottom right;
-            animation: wave 2s ease-in-out infinite;
-        }}
-        @keyframes wave {{
-            0%, 100% {{transform: rotate(0deg);}}
-            50% {{transform: rotate(-20deg);}}
-        }}
-        
-        .hand {{
-            width: 40px; height: 50px;
-            background: #dbe7f0;
-            border: 3px solid #1a2530;
-            border-radius: 15px 15px 10px 10px;
-            position: relative;
-        }}
-        .finger {{
-            width: 8px; height: 20px;
-            background: #dbe7f0;
-            border: 3px solid #1a2530;
-            border-radius: 5px;
-            position: absolute; top: -15px;
-        }}
-        .f1 {{left: -2px; transform: rotate(-20deg);}}
-        .f2 {{left: 10px; top: -20px;}}
-        .f3 {{left: 22px; top: -18px; transform: rotate(10deg);}}
-        .thumb {{
-            width: 10px; height: 25px;
-            background: #dbe7f0;
-            border: 3px solid #1a2530;
-            border-radius: 5px;
-            position: absolute; right: -8px; top: 15px;
-            transform: rotate(40deg);
-        }}
-        .palm-detail {{
-            width: 15px; height: 15px;
-            background: #1a2530;
-            border-radius: 50%;
-            position: absolute; top: 20px; left: 10px;
-            opacity: 0.2;
-        }}
-        
-    </style>
-    </head>
-    <body>
-    <div class="container">
-        <div class="anim-box">
-            <div class="robo-container">
-                <!-- Ears (behind head) -->
-                <div class="ear left"></div>
-                <div class="ear right"></div>
-                
-                <!-- Head -->
-                <div class="robo-head">
-                    <div class="forehead-panel"></div>
-                    <div class="face-panel">
-                        <div class="eye left"></div>
-                        <div class="eye right"></div>
-                        <div class="cheek left"></div>
-                        <div class="cheek right"></div>
-                        <div class="mouth" id="roboMouth"></div>
-                    </div>
-                </div>
-                
-                <!-- Neck & Body -->
-                <div class="neck"></div>
-                <div class="body">
-                    <div class="chest-panel"></div>
-                </div>
-                
-                <!-- Arms -->
-                <div class="hand-container">
-                    <div class="hand">
-                        <div class="finger f1"></div>
-                        <div class="finger f2"></div>
-                        <div class="finger f3"></div>
-                        <div class="thumb"></div>
-                        <div class="palm-detail"></div>
-                    </div>
-                </div>
-                <div class="arm right"></div>
-                
+    Args:
+        turn (str): Identifies the turn; a new value stops the previous audio.
+        message (dict): The assistant message; "audio_segments" holds the encoded
+            audio available so far, in playback order.
+        autoplay (bool): Start playing as soon as segments arrive.
+    """
+    segments = message["audio_segments"]
+    for i, audio in enumerate(segments):
+        if not isinstance(audio, bytes):
+            # The media file manager keeps bytes: copy each segment once, the first
+            # time it is shown, so registering it again later only hashes it
+            segments[i] = bytes(audio)
+    urls = [_audio_src(audio, f"robot_player.{i}") for i, audio in enumerate(segments)]
+    metrics.record("app.player_payload_bytes", sum(len(url) for url in urls))
+    _robot_player(turn=turn, segments=urls, autoplay=autoplay, key="robot_player", default=None)
+
+def _collect_speech(message):
+    """
+    Move the reply's finished sentences, in order, from pending speech onto the
+    message. Never waits: sentences still being synthesized are left for the
+    next poll.
+    
+    Returns:
+        bool: True once the whole reply has been delivered (or its speech failed).
+    """
+    pending = st.session_state.pending_speech
+    stream = st.session_state.reply_stream
+    if stream is not None:
+        pending.extend(stream.take_speech())
+    try:
+        while pending and pending[0].done():
+            message["audio_segments"].append(pending.pop(0).result())
+            if stream is not None and len(message["audio_segments"]) == 1:
+                metrics.record("app.time_to_first_audio", time.perf_counter() - stream.turn_start)
+    except Exception as e:
+        pending.clear()
+        # Kept on the message so it is still shown after the rerun that ends delivery
+        message["speech_error"] = str(e)
+    else:
+        if pending or (stream is not None and not stream.finished):
+            return False
+        _record_turn_audio(message["audio_segments"])
+    st.session_state.reply_stream = None
+    return True
+
+def robot_panel():
+    """
+    The robot and its player. While the latest reply is still being synthesized
+    this runs as a fragment on a timer, so finished sentences reach the player
+    without rerunning the whole page.
+    """
+    if st.session_state.latest_audio_turn is None:
+        # Placeholder or default state if needed
+        st.markdown("""
+            <div style="text-align: center; padding: 2rem; color: #6b7280; background: white; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
+                <div style="font-size: 3rem; margin-bottom: 1rem;">🤖</div>
+                <p>I'm ready to interview you!</p>
             </div>
-        </div>
-        
-        <div class="controls">
-            <button class="play-btn" id="playBtn">▶ Play Audio</button>
-            <div class="status" id="status">Ready to play</div>
-            <div class="progress-container"><div class="progress-bar" id="progressBar"></div></div>
-        </div>
-        
-        <audio id="audioPlayer" preload="auto" {autoplay_attr}><source src="data:audio/wav;base64,{audio_base64}" type="audio/wav"></audio>
-    </div>
+        """, unsafe_allow_html=True)
+        return
     
-    <script>
-    const audio = document.getElementById('audioPlayer');
-    const playBtn = document.getElementById('playBtn');
-    const status = document.getElementById('status');
-    const progressBar = document.getElementById('progressBar');
-    let isPlaying = false;
-
-    playBtn.addEventListener('click', function() {{
-        if(isPlaying) {{
-            audio.pause();
-        }} else {{
-            audio.play();
-        }}
-    }});
-
-    audio.addEventListener('play', function() {{
-        isPlaying = true;
-        playBtn.textContent = '⏸ Pause';
-        playBtn.classList.add('playing');
-        status.textContent = 'Playing...';
-        
-        // Activate Robotic Face
-        document.getElementById('roboMouth').classList.add('speaking');
-    }});
-
-    audio.addEventListener('pause', function() {{
-        isPlaying = false;
-        playBtn.textContent = '▶ Play Audio';
-        playBtn.classList.remove('playing');
-        status.textContent = 'Paused';
+    message = st.session_state.conversation_history[st.session_state.latest_audio_turn]
+    stream = st.session_state.reply_stream
+    if st.session_state.pending_speech or stream is not None:
+        if _collect_speech(message):
+            # Everything has been delivered; a full rerun stops the timer
+            st.rerun()
+        if stream is not None and stream.result.done() and not stream.finished:
+            # The reply is complete: a full rerun shows all of it and applies its decision
+            st.rerun()
+    if "speech_error" in message:
+        st.error(f"Error generating speech: {message['speech_error']}")
+    
+    # Every turn plays from its first segment; the player queues segments that
+    # arrive on later reruns behind the ones already playing
+    turn = f"{st.session_state.interview_session.thread_id}:{st.session_state.latest_audio_turn}"
+    robot_player(turn, message, autoplay=True)
+
+def add_to_history(entry):
+    """Append a conversation entry and bump the history version."""
+    st.session_state.conversation_history.append(entry)
+    st.session_state.history_version += 1
+
+def _track_first_segment(future, earlier, turn_start):
+    """
+    Record when the reply's first sentence went to TTS and when its audio was
+    ready, both measured from the start of the turn; later sentences pass through.
+    
+    Args:
+        future (concurrent.futures.Future): The sentence's speech.
+        earlier (list): Speech futures already submitted for this reply.
+        turn_start (float): time.perf_counter() when the turn started.
         
-        // Deactivate Robotic Face
-        document.getElementById('roboMouth').classList.remove('speaking');
-    }});
-
-    audio.addEventListener('ended', function() {{
-        isPlaying = false;
-        playBtn.textContent = '▶ Play Again';
-        playBtn.classList.remove('playing');
-        status.textContent = 'Finished';
-        progressBar.style.width = '0%';
+    Returns:
+        concurrent.futures.Future: The same future.
+    """
+    if not earlier:
+        metrics.record("app.time_to_first_tts", time.perf_counter() - turn_start)
+        future.add_done_callback(
+            lambda _: metrics.record("app.time_to_first_segment", time.perf_counter() - turn_start)
+        )
+    return future
+
+class ReplyStream:
+    """
+    Generates a reply on a background thread, handing each sentence to TTS as
+    soon as the LLM closes it. The page shows the reply and starts playing it
+    while the rest is still being generated.
+    
+    Args:
+        session (InterviewSession): The candidate's interview session.
+        text (str): The candidate's answer.
+        turn_start (float): time.perf_counter() when the turn started.
+    """
+
+    def __init__(self, session, text, turn_start):
+        self.turn_start = turn_start
+        self.sentences = []
+        self.speech = []            # speech futures in playback order
+        self.result = Future()      # (response_text, control_decision)
+        self.finished = False       # set once the page has applied the result
+        self._taken = 0
+        self._first = threading.Event()
+        threading.Thread(target=self._run, args=(session, text), daemon=True).start()
+
+    def _run(self, session, text):
+        try:
+            for kind, value in stream_with_agent(session, text):
+                if kind == "sentence":
+                    self.speech.append(_track_first_segment(submit_speech(value), self.speech, self.turn_start))
+                    self.sentences.append(value)
+                    self._first.set()
+                else:
+                    self.result.set_result(value)
+        except Exception as e:
+            self.result.set_exception(e)
+        finally:
+            self._first.set()
+
+    def wait_first_sentence(self):
+        """Block until the first sentence has gone to TTS or the reply has ended."""
+        self._first.wait()
+
+    def take_speech(self):
+        """
+        Returns:
+            list: Speech futures submitted since the last call, in playback order.
+        """
+        taken = self.speech[self._taken:]
+        self._taken += len(taken)
+        return taken
+
+def _apply_decision(control_decision):
+    """Close the interview and queue it for scoring once the agent stops."""
+    if control_decision == "stop":
+        st.session_state.interview_active = False
+        # Queue the finished interview for batch scoring
+        enqueue_transcript(st.session_state.interview_session.thread_id,
+                           st.session_state.conversation_history)
+
+def _finish_reply(stream):
+    """Replace the streamed reply's partial text with the full reply and apply its decision."""
+    stream.finished = True
+    st.session_state.processing = False
+    try:
+        agent_response, control_decision = stream.result.result()
+    except Exception as e:
+        st.error(f"Error generating AI response: {e}")
+        return
+    st.session_state.conversation_history[st.session_state.latest_audio_turn]["content"] = agent_response
+    st.session_state.history_version += 1
+    _apply_decision(control_decision)
+
+def _record_turn_audio(audio_segments):
+    """Record the audio bytes delivered for one complete turn."""
+    metrics.record("app.audio_bytes_per_turn", sum(len(audio) for audio in audio_segments))
+
+@st.cache_resource(show_spinner=False)
+def greeting_audio(prompt_version, voice):
+    """
+    Synthesize the greeting once per prompt version and voice; every session
+    shares the resulting audio, held in memory. The arguments only serve as
+    the cache key.
+    """
+    text, _ = greeting()
+    return text_to_speech(text)
+
+@st.cache_resource(show_spinner=False)
+def prewarm_greeting(prompt_version, voice):
+    """
+    Try to precompute the greeting once per prompt version and voice. A failure
+    (e.g. an LLM or TTS outage) is returned rather than raised, so page loads
+    never fail on it and don't retry it; the greeting is then generated when
+    Start is clicked.
+    """
+    try:
+        greeting_audio(prompt_version, voice)
+    except Exception as e:
+        print(f"Failed to prewarm the greeting: {e}")
+        return e
+
+@st.cache_resource(show_spinner=False)
+def prewarm_templates(prompt_version, voice):
+    """
+    Start synthesizing the template replies once per prompt version and voice.
+    Runs in the background; the arguments only serve as the cache key.
+    """
+    return prewarm(template_replies())
+
+def reveal_html(text, words_per_second):
+    """
+    Render text as words that fade in one after another at the given pace.
+    The animation runs in the browser, so the script never waits on it.
+    
+    Args:
+        text (str): The message text.
+        words_per_second (float): Reveal pace, matched to the speaking rate.
         
-        // Deactivate Robotic Face
-        document.getElementById('roboMouth').classList.remove('speaking');
-    }});
-
-    audio.addEventListener('timeupdate', function() {{
-        const progress = (audio.currentTime / audio.duration) * 100;
-        progressBar.style.width = progress + '%';
-    }});
-    </script>
-    </body>
-    </html>
+    Returns:
+        str: HTML for st.markdown(unsafe_allow_html=True).
     """
+    words = text.split()
+    return " ".join(
+        f'<span class="reveal-word" style="animation-delay:{i / words_per_second:.2f}s">{html.escape(word)}</span>'
+        for i, word in enumerate(words)
+    )
 
-def response_generator(input_msg): 
-    for word in input_msg.split(): 
-        yield word + " " 
-        time.sleep(0.01)  # Faster streaming for better UX
+run_started = time.perf_counter()
 
 st.set_page_config(page_title="Sigmoid AI Screening", page_icon="🎙️", layout="wide")
 
@@ -423,6 +353,15 @@ st.markdown("""
         text-align: center;
     }
     
+    /* Word-by-word reveal of the latest reply, paced to the audio */
+    .reveal-word {
+        opacity: 0;
+        animation: reveal-word 0.2s ease-out forwards;
+    }
+    @keyframes reveal-word {
+        to { opacity: 1; }
+    }
+    
     /* Chat message styling */
     .stChatMessage {
         border-radius: 12px;
@@ -488,93 +427,29 @@ with st.sidebar:
         # Clear Conversation
         if st.button("🗑️ Clear Conversation", use_container_width=True):
             st.session_state.conversation_history = []
+            st.session_state.history_version += 1
+            st.session_state.transcript_pdf = TranscriptPDF()
             st.session_state.displayed_messages = 0
+            st.session_state.latest_audio_turn = None
+            st.session_state.pending_speech = []
+            st.session_state.reply_stream = None
+            sessions.end(st.session_state.interview_session)
+            audio_store.release(st.session_state.interview_session.thread_id)
+            st.session_state.interview_session = sessions.create()
+            audio_store.retain(st.session_state.interview_session.thread_id)
             st.rerun()
             
         st.divider()
         
         st.subheader("📥 Export")
         
-        def generate_pdf():
-            """Generate PDF transcript"""
-            buffer = io.BytesIO()
-            doc = SimpleDocTemplate(buffer, pagesize=letter,
-                                  rightMargin=72, leftMargin=72,
-                                  topMargin=72, bottomMargin=18)
-            
-            # Container for the 'Flowable' objects
-            elements = []
-            
-            # Define styles
-            styles = getSampleStyleSheet()
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=24,
-                textColor='#1f2937',
-                spaceAfter=30,
-                alignment=TA_CENTER
-            )
-            
-            heading_style = ParagraphStyle(
-                'CustomHeading',
-                parent=styles['Heading2'],
-                fontSize=14,
-                textColor='#374151',
-                spaceAfter=12,
-                spaceBefore=12
-            )
-            
-            normal_style = ParagraphStyle(
-                'CustomNormal',
-                parent=styles['Normal'],
-                fontSize=11,
-                textColor='#1f2937',
-                spaceAfter=8
-            )
-            
-            role_style = ParagraphStyle(
-                'RoleStyle',
-                parent=styles['Normal'],
-                fontSize=12,
-                textColor='#0284c7',
-                fontName='Helvetica-Bold',
-                spaceAfter=4
-            )
-            
-            # Add title
-            elements.append(Paragraph("SIGMOID AI CANDIDATE SCREENING", title_style))
-            elements.append(Spacer(1, 0.2*inch))
-            
-            # Add interview details
-            elements.append(Paragraph("Interview Details", heading_style))
-            elements.append(Paragraph(f"<b>Job Role:</b> Data Scientist", normal_style))
-            elements.append(Paragraph(f"<b>Interview Type:</b> HR Screening", normal_style))
-            elements.append(Paragraph(f"<b>Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", normal_style))
-            elements.append(Spacer(1, 0.3*inch))
-            
-            # Add conversation
-            elements.append(Paragraph("Conversation Transcript", heading_style))
-            elements.append(Spacer(1, 0.2*inch))
-            
-            for i, msg in enumerate(st.session_state.conversation_history, 1):
-                role = "CANDIDATE" if msg["role"] == "user" else "INTERVIEWER"
-                elements.append(Paragraph(f"{role}:", role_style))
-                # Escape special characters and preserve formatting
-                content = msg['content'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                elements.append(Paragraph(content, normal_style))
-                elements.append(Spacer(1, 0.15*inch))
-            
-            # Build PDF
-            doc.build(elements)
-            buffer.seek(0)
-            return buffer
-        
-        # Download as PDF
-        pdf_buffer = generate_pdf()
+        # Built only when the button is clicked, and only if the conversation changed since the last export
+        transcript_pdf = st.session_state.transcript_pdf
+        history = list(st.session_state.conversation_history)
+        history_version = st.session_state.history_version
         st.download_button(
             label="📄 Download as PDF",
-            data=pdf_buffer,
+            data=lambda: transcript_pdf.build(history, history_version),
             file_name=f"interview_transcript_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
             mime="application/pdf",
             use_container_width=True
@@ -586,9 +461,15 @@ class Recorder:
         self.frames = []
         self.stream = None
         self.is_recording = False
+        self.transcriber = None
+        self.endpointer = None
 
     def start(self, fs):
+        import sounddevice as sd
+        
         self.frames = []
+        self.transcriber = StreamingTranscriber(fs) if STREAMING_ASR else None
+        self.endpointer = Endpointer(fs)
         self.is_recording = True
         self.stream = sd.InputStream(
             samplerate=fs,
@@ -603,23 +484,61 @@ class Recorder:
             self.stream.stop()
             self.stream.close()
             self.stream = None
+            # Silence between the end of the answer and the end of recording
+            metrics.record("app.turn_gap", self.endpointer.trailing_silence())
         self.is_recording = False
 
     def reset(self):
         self.stop()
         self.frames = []
+        self.transcriber = None
+        self.endpointer = None
         self.is_recording = False
 
     def _callback(self, indata, frames, time, status):
         if status:
             print(status)
-        self.frames.append(indata.copy())
+        block = indata.copy()
+        self.frames.append(block)
+        if self.transcriber:
+            self.transcriber.feed(block)
+        self.endpointer.feed(block)
+
+    def turn_ended(self):
+        """True once the endpointer has detected the end of the answer."""
+        return self.endpointer is not None and self.endpointer.ended
+
+    def transcribe(self, fs):
+        """Return the transcript, finishing the live transcription if one is running."""
+        if self.transcriber:
+            transcriber, self.transcriber = self.transcriber, None
+            return transcriber.finish()
+        return transcribe_audio(self.get_audio(), fs)
 
     def get_audio(self):
         if not self.frames:
             return None
         return np.concatenate(self.frames, axis=0)
 
+@st.fragment(run_every=ENDPOINT_POLL_INTERVAL)
+def watch_endpoint():
+    """
+    While recording, stop as if Stop had been clicked once the endpointer
+    detects that the candidate has finished speaking. Runs as a fragment on a
+    timer, so the rest of the page stays responsive between checks.
+    """
+    recorder = st.session_state.recorder
+    if recorder.is_recording and recorder.turn_ended():
+        recorder.stop()
+        st.session_state.processing = True
+        st.session_state.audio_processed = False
+        st.rerun()
+
+if PREWARM_GREETING:
+    prewarm_greeting(greeting_fingerprint(), voice_fingerprint())
+if PREWARM_TEMPLATES:
+    prewarm_templates(greeting_fingerprint(), voice_fingerprint())
+
 # Initialize session state
 if 'recorder' not in st.session_state:
     st.session_state.recorder = Recorder()
@@ -627,6 +546,13 @@ if 'fs' not in st.session_state:
     st.session_state.fs = 44100
 if 'conversation_history' not in st.session_state:
     st.session_state.conversation_history = []
+if 'history_version' not in st.session_state:
+    st.session_state.history_version = 0
+if 'transcript_pdf' not in st.session_state:
+    st.session_state.transcript_pdf = TranscriptPDF()
+if 'interview_session' not in st.session_state:
+    st.session_state.interview_session = sessions.create()
+    audio_store.retain(st.session_state.interview_session.thread_id)
 if 'processing' not in st.session_state:
     st.session_state.processing = False
 if 'displayed_messages' not in st.session_state:
@@ -637,10 +563,17 @@ if 'interview_started' not in st.session_state:
     st.session_state.interview_started = False
 if 'interview_active' not in st.session_state:
     st.session_state.interview_active = True
-if 'latest_audio_path' not in st.session_state:
-    st.session_state.latest_audio_path = None
-if 'last_played_audio' not in st.session_state:
-    st.session_state.last_played_audio = None
+if 'latest_audio_turn' not in st.session_state:
+    st.session_state.latest_audio_turn = None
+if 'pending_speech' not in st.session_state:
+    st.session_state.pending_speech = []
+if 'reply_stream' not in st.session_state:
+    st.session_state.reply_stream = None
+
+# A streamed reply has finished generating: show all of it and apply its decision
+reply_stream = st.session_state.reply_stream
+if reply_stream is not None and reply_stream.result.done() and not reply_stream.finished:
+    _finish_reply(reply_stream)
 
 # Display conversation history
 # st.subheader("💬 Conversation")
@@ -649,28 +582,10 @@ if 'last_played_audio' not in st.session_state:
 col_chat, col_robot = st.columns([0.7, 0.3], gap="medium")
 
 with col_robot:
-    # Robot Player Section (Sticky)
-    if st.session_state.get('latest_audio_path'):
-        # Determine if we should autoplay
-        # Autoplay if: 1) This is a new audio (different from last played), OR 2) This is the first audio (last_played_audio is None)
-        should_autoplay = False
-        current_audio = st.session_state.get('latest_audio_path')
-        last_audio = st.session_state.get('last_played_audio')
-        
-        if current_audio != last_audio or last_audio is None:
-            should_autoplay = True
-            st.session_state.last_played_audio = current_audio
-            
-        robo_html = get_robo_html(st.session_state.latest_audio_path, autoplay=should_autoplay)
-        components.html(robo_html, height=400)
-    else:
-        # Placeholder or default state if needed
-        st.markdown("""
-            <div style="text-align: center; padding: 2rem; color: #6b7280; background: white; border-radius: 12px; box-shadow: 0 4px 6px rgba(0,0,0,0.05);">
-                <div style="font-size: 3rem; margin-bottom: 1rem;">🤖</div>
-                <p>I'm ready to interview you!</p>
-            </div>
-        """, unsafe_allow_html=True)
+    # Robot Player Section (Sticky). It polls on its own while the reply's
+    # speech is still arriving.
+    delivering = bool(st.session_state.pending_speech) or st.session_state.reply_stream is not None
+    st.fragment(robot_panel, run_every=SPEECH_POLL_INTERVAL if delivering else None)()
 
 with col_chat:
     # Start Interview Button
@@ -679,21 +594,26 @@ with col_chat:
         
         if st.button("🎬 Start Interview", use_container_width=True, type="primary"):
             with st.spinner("Starting interview..."):
-                # Call start_interview from agent
-                agent_response, control_decision = start_interview()
-                
-                # Generate TTS for the greeting
-                tts_audio_path = text_to_speech(agent_response)
+                try:
+                    # Call start_interview from agent
+                    agent_response, control_decision = start_interview(st.session_state.interview_session)
+                    
+                    # Greeting audio is precomputed and shared across sessions
+                    # (generated here if prewarming it failed)
+                    tts_audio = greeting_audio(greeting_fingerprint(), voice_fingerprint())
+                except Exception as e:
+                    st.error(f"Error starting interview: {e}")
+                    st.stop()
                 
                 # Add assistant message to history
-                st.session_state.conversation_history.append({
+                add_to_history({
                     "role": "assistant",
                     "content": agent_response,
-                    "audio_path": tts_audio_path
+                    "audio_segments": [tts_audio]
                 })
                 
                 # Set latest audio for the robot
-                st.session_state.latest_audio_path = tts_audio_path
+                st.session_state.latest_audio_turn = len(st.session_state.conversation_history) - 1
                 
                 # Update interview state
                 st.session_state.interview_started = True
@@ -705,23 +625,16 @@ with col_chat:
         if not st.session_state.conversation_history:
             st.info("👋 Interview started. Please use the recording buttons below.")
 
+    # A new turn is being shown for the first time in this run
+    new_turn_shown = len(st.session_state.conversation_history) > st.session_state.displayed_messages
+
     for idx, message in enumerate(st.session_state.conversation_history):
         with st.chat_message(message["role"]):
-            # Check if this is a new assistant message that needs streaming
-            is_new_message = (message["role"] == "assistant" and 
-                            idx >= st.session_state.displayed_messages)
-            
-            if is_new_message:
-                # Stream the assistant's response manually (only for new messages)
-                message_placeholder = st.empty()
-                full_response = ""
-                for word in message["content"].split():
-                    full_response += word + " "
-                    message_placeholder.markdown(full_response + "▌")
-                    time.sleep(0.25)
-                message_placeholder.markdown(message["content"])
+            if idx == st.session_state.latest_audio_turn:
+                # The reply being spoken reveals itself word by word in the browser.
+                # The markup is identical on every rerun, so the animation is not restarted.
+                st.markdown(reveal_html(message["content"], REVEAL_WORDS_PER_SECOND), unsafe_allow_html=True)
             else:
-                # Display already-shown messages normally (no streaming)
                 st.markdown(message["content"])
 
     # Update displayed messages count
@@ -760,10 +673,18 @@ with col_chat:
                 st.session_state.audio_processed = False  # Reset flag for new recording
                 st.rerun()
 
+    if new_turn_shown:
+        metrics.record("app.time_to_interactive", time.perf_counter() - run_started)
+
     # Status indicators
     if st.session_state.recorder.is_recording:
         st.markdown('<div class="recording-indicator">🔴 Recording in progress... Speak clearly into your microphone</div>', unsafe_allow_html=True)
 
+    # Poll for the end of the answer without holding the script, so Stop and
+    # Clear Conversation take effect immediately
+    if AUTO_ENDPOINT and st.session_state.recorder.is_recording:
+        watch_endpoint()
+
     if st.session_state.processing:
         st.markdown('<div class="processing-indicator">🤖 Just a moment...</div>', unsafe_allow_html=True)
 
@@ -788,16 +709,18 @@ with col_chat:
                 status_text.text("Processing user input...")
                 progress_bar.progress(25)
                 
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as fp:
-                    write(fp.name, st.session_state.fs, audio_data)
-                    user_audio_path = fp.name
+                from scipy.io.wavfile import write
+                wav_buffer = io.BytesIO()
+                write(wav_buffer, st.session_state.fs, audio_data)
+                user_audio_path = audio_store.save(st.session_state.interview_session.thread_id,
+                                                   wav_buffer.getvalue(), ".wav", kind="user")
                 
                 # Transcribe
-                transcription = transcribe_audio(audio_data, st.session_state.fs)
+                transcription = st.session_state.recorder.transcribe(st.session_state.fs)
                 progress_bar.progress(50)
                 
                 # Add user message to history immediately
-                st.session_state.conversation_history.append({
+                add_to_history({
                     "role": "user",
                     "content": transcription,
                     "audio_path": user_audio_path
@@ -832,29 +755,59 @@ with col_chat:
             status_text.text("Generating AI response...")
             progress_bar.progress(33)
             
-            agent_response, control_decision = process_with_agent(last_user_message)
+            turn_start = time.perf_counter()
+            if STREAM_TTS:
+                # Generate the reply in the background and show it from its first
+                # sentence; the robot panel plays each sentence as its audio arrives
+                # and reruns the page once the reply is complete
+                stream = ReplyStream(st.session_state.interview_session, last_user_message, turn_start)
+                stream.wait_first_sentence()
+                if not stream.sentences:
+                    # Nothing to show yet: the reply failed or came back empty
+                    agent_response, control_decision = stream.result.result()
+                    stream.speech.extend(speak_sentences(agent_response))
+                    stream.sentences.append(agent_response)
+                add_to_history({
+                    "role": "assistant",
+                    "content": " ".join(stream.sentences),
+                    "audio_segments": []
+                })
+                st.session_state.latest_audio_turn = len(st.session_state.conversation_history) - 1
+                st.session_state.reply_stream = stream
+                # Still processing until the reply is complete (see _finish_reply)
+                progress_bar.empty()
+                status_text.empty()
+                st.rerun()
+            
+            agent_response, control_decision = process_with_agent(st.session_state.interview_session, last_user_message)
+            # Synthesize the reply sentence by sentence, all at once
+            speech_futures = speak_sentences(agent_response)
+            _track_first_segment(speech_futures[0], [], turn_start)
             
-            # Generate TTS for agent response
+            # Hand the first sentence to the player as soon as it is ready;
+            # the rest are picked up on the following reruns
             progress_bar.progress(66)
-            
-            tts_audio_path = text_to_speech(agent_response)
+            audio_segments = [speech_futures[0].result()]
+            metrics.record("app.time_to_first_audio", time.perf_counter() - turn_start)
             
             progress_bar.progress(100)
             status_text.text("✅ Complete!")
             
             # Add assistant message to history
-            st.session_state.conversation_history.append({
+            add_to_history({
                 "role": "assistant",
                 "content": agent_response,
-                "audio_path": tts_audio_path
+                "audio_segments": audio_segments
             })
             
             # Set latest audio for the robot
-            st.session_state.latest_audio_path = tts_audio_path
+            st.session_state.latest_audio_turn = len(st.session_state.conversation_history) - 1
+            st.session_state.pending_speech = speech_futures[1:]
+            if not st.session_state.pending_speech:
+                _record_turn_audio(audio_segments)
             
             # Check control decision and update interview state
-            if control_decision == "stop":
-                st.session_state.interview_active = False
+            _apply_decision(control_decision)
             
         except Exception as e:
             st.error(f"Error generating AI response: {e}")
@@ -864,3 +817,6 @@ with col_chat:
         progress_bar.empty()
         status_text.empty()
         st.rerun()
+
+metrics.record("app.rerun_seconds", time.perf_counter() - run_started)
+
@@ -0,0 +1,157 @@
+import io
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from dotenv import load_dotenv
+from resilience import CallPolicy
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+ASR_TIMEOUT = float(os.getenv("ASR_TIMEOUT", "30"))
+ASR_UPLOAD_FORMAT = os.getenv("ASR_UPLOAD_FORMAT", "flac")  # "flac", "opus" or "wav"
+LOCAL_ASR_MODEL_PATH = os.getenv("LOCAL_ASR_MODEL_PATH", "")
+LOCAL_ASR_COMPUTE_TYPE = os.getenv("LOCAL_ASR_COMPUTE_TYPE", "int8")
+LOCAL_ASR_WORKERS = int(os.getenv("LOCAL_ASR_WORKERS", "2"))
+LOCAL_ASR_CPU_THREADS = int(os.getenv("LOCAL_ASR_CPU_THREADS", "4"))
+
+asr_policy = CallPolicy("asr", timeout=ASR_TIMEOUT)
+
+
+def encode_audio(samples, fs, fmt=ASR_UPLOAD_FORMAT):
+    """
+    Encode mono int16 audio for upload.
+
+    Args:
+        samples (numpy.ndarray): int16 mono audio.
+        fs (int): Sampling rate.
+        fmt (str): "flac", "opus" or "wav". Compressed formats need the
+            optional soundfile package and fall back to WAV without it.
+
+    Returns:
+        tuple: (filename, bytes) ready to pass as the upload file.
+    """
+    buffer = io.BytesIO()
+    if fmt in ("flac", "opus"):
+        try:
+            import soundfile as sf
+        except ImportError:
+            fmt = "wav"
+        else:
+            if fmt == "flac":
+                sf.write(buffer, samples, fs, format="FLAC", subtype="PCM_16")
+                return "audio.flac", buffer.getvalue()
+            sf.write(buffer, samples, fs, format="OGG", subtype="OPUS")
+            return "audio.ogg", buffer.getvalue()
+
+    from scipy.io.wavfile import write
+    write(buffer, fs, samples)
+    return "audio.wav", buffer.getvalue()
+
+
+class WhisperAPIBackend:
+    """
+    Hosted OpenAI Whisper. Audio is compressed before upload and every call
+    goes through the ASR call policy (deadline, retries, hedging).
+    """
+
+    name = "openai"
+
+    def __init__(self, model="whisper-1", api_key=None):
+        from openai import OpenAI
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
+        self.model = model
+        # Retries are handled by the call policy, so the client itself never retries
+        self.client = OpenAI(api_key=api_key, timeout=ASR_TIMEOUT, max_retries=0)
+
+    def transcribe(self, samples, fs):
+        """
+        Args:
+            samples (numpy.ndarray): int16 mono audio.
+            fs (int): Sampling rate.
+
+        Returns:
+            str: The transcribed text.
+        """
+        filename, payload = encode_audio(samples, fs)
+        metrics.record("asr.upload_bytes", len(payload))
+        # Pass raw bytes so retries and hedges can resend them
+        transcription = asr_policy.call(
+            self.client.audio.transcriptions.create,
+            model=self.model,
+            file=(filename, payload),
+            language="en"   # Force English transcription
+        )
+        return transcription.text
+
+
+class LocalWhisperBackend:
+    """
+    Whisper-family model running on the CPU through faster-whisper.
+
+    The model is loaded once and warmed up when the backend is created, then
+    shared by a small worker pool so several sessions can transcribe at once
+    without each paying the load time.
+    """
+
+    name = "local"
+
+    def __init__(self, model_path=LOCAL_ASR_MODEL_PATH, compute_type=LOCAL_ASR_COMPUTE_TYPE,
+                 workers=LOCAL_ASR_WORKERS, cpu_threads=LOCAL_ASR_CPU_THREADS):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError("ASR_BACKEND=local needs the faster-whisper package: pip install faster-whisper") from e
+        if not model_path:
+            raise ValueError("LOCAL_ASR_MODEL_PATH must point to a converted Whisper model for ASR_BACKEND=local.")
+
+        started = time.perf_counter()
+        # num_workers lets that many transcribe calls run on the model in parallel
+        self.model = WhisperModel(model_path, device="cpu", compute_type=compute_type,
+                                  cpu_threads=cpu_threads, num_workers=workers)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="local-asr")
+        # One short dummy run so the first real answer doesn't pay for lazy initialization
+        self._run(np.zeros(16000, dtype=np.float32))
+        metrics.record("asr.local_load", time.perf_counter() - started)
+
+    def _run(self, audio):
+        segments, _ = self.model.transcribe(audio, language="en", beam_size=1, vad_filter=False)
+        # Segments are generated lazily; joining them runs the decoder
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+    def transcribe(self, samples, fs):
+        """
+        Args:
+            samples (numpy.ndarray): int16 mono audio at 16 kHz.
+            fs (int): Sampling rate; faster-whisper expects 16000.
+
+        Returns:
+            str: The transcribed text.
+        """
+        if fs != 16000:
+            raise ValueError(f"LocalWhisperBackend expects 16 kHz audio, got {fs} Hz.")
+        audio = samples.astype(np.float32) / 32768.0
+        started = time.perf_counter()
+        text = self._pool.submit(self._run, audio).result(timeout=ASR_TIMEOUT)
+        metrics.record("asr.local_latency", time.perf_counter() - started)
+        return text
+
+
+def make_asr_backend(backend):
+    """
+    Build the speech-to-text backend.
+
+    Args:
+        backend (str): "openai" (hosted Whisper) or "local" (faster-whisper on CPU).
+
+    Returns:
+        An object with transcribe(samples, fs) -> str.
+    """
+    if backend == "openai":
+        return WhisperAPIBackend(api_key=os.getenv("OPENAI_API_KEY"))
+    if backend == "local":
+        return LocalWhisperBackend()
+    raise ValueError(f"Unknown ASR_BACKEND '{backend}'. Use 'openai' or 'local'.")
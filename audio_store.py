@@ -0,0 +1,207 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+from dotenv import load_dotenv
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+AUDIO_STORE_DIR = os.getenv("AUDIO_STORE_DIR", os.path.join(tempfile.gettempdir(), "screening-audio"))
+AUDIO_STORE_QUOTA_MB = float(os.getenv("AUDIO_STORE_QUOTA_MB", "512"))
+# Sessions nobody has released (e.g. the browser tab was closed) are removed after this long idle
+AUDIO_STORE_TTL = float(os.getenv("AUDIO_STORE_TTL", "3600"))
+# Keep a compressed copy of the candidate's answers when their session is removed
+ARCHIVE_USER_AUDIO = os.getenv("ARCHIVE_USER_AUDIO", "0") == "1"
+AUDIO_ARCHIVE_DIR = os.getenv("AUDIO_ARCHIVE_DIR", "audio_archive")
+
+# Artifacts shared by every session; never collected
+SHARED = "shared"
+# How often saves may trigger a TTL sweep, in seconds
+SWEEP_INTERVAL = 60.0
+
+
+class AudioStore:
+    """
+    Owns every audio file the app writes (the candidate's recordings), one
+    directory per session. Synthesized speech is kept in memory and never
+    written here.
+
+    A session's files are deleted when the last holder releases it, or once it
+    has been idle for the TTL; the TTL also covers held sessions, since a
+    browser tab that is simply closed never releases its hold. When the store
+    grows past its quota, the least recently active sessions that nobody holds
+    are removed first.
+    """
+
+    def __init__(self, directory, quota_bytes, ttl, archive_dir=None):
+        self.directory = directory
+        self.quota_bytes = quota_bytes
+        self.ttl = ttl
+        self.archive_dir = archive_dir
+        self._lock = threading.Lock()
+        self._sizes = {}        # session -> bytes on disk
+        self._counts = {}       # session -> files written, for naming
+        self._active = {}       # session -> last save time
+        self._refs = {}         # session -> holders
+        self._last_sweep = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        # Sessions left over from an earlier process have no holders and age out via the TTL
+        now = time.time()
+        for session in os.listdir(directory):
+            path = os.path.join(directory, session)
+            if not os.path.isdir(path):
+                continue
+            names = os.listdir(path)
+            self._sizes[session] = sum(os.path.getsize(os.path.join(path, name)) for name in names)
+            self._counts[session] = len(names)
+            self._active[session] = time.monotonic() - (now - os.path.getmtime(path))
+
+    def _session_dir(self, session):
+        return os.path.join(self.directory, session)
+
+    def retain(self, session):
+        """
+        Mark a session as in use so it is not collected.
+
+        Args:
+            session (str): Session id (e.g. the interview's thread id).
+        """
+        with self._lock:
+            self._refs[session] = self._refs.get(session, 0) + 1
+            self._active[session] = time.monotonic()
+
+    def release(self, session):
+        """
+        Drop one hold on a session; its files are removed once nobody holds it.
+
+        Args:
+            session (str): Session id.
+        """
+        with self._lock:
+            refs = self._refs.get(session, 0) - 1
+            if refs > 0:
+                self._refs[session] = refs
+                return
+            self._refs.pop(session, None)
+        self._remove(session)
+
+    def save(self, session, data, suffix, kind="user"):
+        """
+        Write one audio artifact.
+
+        Args:
+            session (str): Owning session id, or SHARED for artifacts every session uses.
+            data (bytes): Encoded audio.
+            suffix (str): File suffix including the dot, e.g. ".mp3".
+            kind (str): e.g. "user"; user answers can be archived on removal.
+
+        Returns:
+            str: Path of the stored file.
+        """
+        session = session or SHARED
+        with self._lock:
+            index = self._counts.get(session, 0)
+            self._counts[session] = index + 1
+            self._active[session] = time.monotonic()
+        os.makedirs(self._session_dir(session), exist_ok=True)
+        path = os.path.join(self._session_dir(session), f"{kind}-{index:04d}{suffix}")
+        with open(path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self._sizes[session] = self._sizes.get(session, 0) + len(data)
+            total = sum(self._sizes.values())
+            sweep = total > self.quota_bytes or time.monotonic() - self._last_sweep > SWEEP_INTERVAL
+        metrics.record("audio_store.disk_bytes", total)
+        if sweep:
+            self.collect()
+        return path
+
+    def collect(self):
+        """
+        Remove sessions idle past the TTL (held or not), then, while over
+        quota, the least recently active sessions nobody holds.
+
+        Returns:
+            int: Number of sessions removed.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._last_sweep = now
+            candidates = sorted(
+                (active, session) for session, active in self._active.items() if session != SHARED
+            )
+            total = sum(self._sizes.values())
+            doomed = []
+            for active, session in candidates:
+                expired = now - active > self.ttl
+                if expired or (total > self.quota_bytes and session not in self._refs):
+                    doomed.append(session)
+                    self._refs.pop(session, None)
+                    total -= self._sizes.get(session, 0)
+        for session in doomed:
+            self._remove(session)
+        return len(doomed)
+
+    def _archive(self, session):
+        """Compress the session's user answers into the archive directory."""
+        source = self._session_dir(session)
+        names = [name for name in os.listdir(source) if name.startswith("user-")]
+        if not names:
+            return
+        from scipy.io.wavfile import read
+        from asr_backends import encode_audio
+        target = os.path.join(self.archive_dir, session)
+        os.makedirs(target, exist_ok=True)
+        for name in sorted(names):
+            path = os.path.join(source, name)
+            if name.endswith(".wav"):
+                fs, samples = read(path)
+                filename, data = encode_audio(samples, fs, "flac")
+                with open(os.path.join(target, os.path.splitext(name)[0] + os.path.splitext(filename)[1]), "wb") as f:
+                    f.write(data)
+            else:
+                shutil.copyfile(path, os.path.join(target, name))
+            metrics.incr("audio_store.archived_files")
+
+    def _remove(self, session):
+        with self._lock:
+            size = self._sizes.pop(session, 0)
+            self._counts.pop(session, None)
+            self._active.pop(session, None)
+        path = self._session_dir(session)
+        if not os.path.isdir(path):
+            return
+        if self.archive_dir:
+            try:
+                self._archive(session)
+            except Exception as e:
+                print(f"Failed to archive audio for session {session}: {e}")
+        shutil.rmtree(path, ignore_errors=True)
+        metrics.incr("audio_store.removed_sessions")
+        metrics.incr("audio_store.removed_bytes", size)
+
+    def usage(self):
+        """
+        Report disk usage.
+
+        Returns:
+            dict: bytes, quota_bytes, sessions and held_sessions.
+        """
+        with self._lock:
+            return {
+                "bytes": sum(self._sizes.values()),
+                "quota_bytes": self.quota_bytes,
+                "sessions": len([session for session in self._sizes if session != SHARED]),
+                "held_sessions": len(self._refs),
+            }
+
+
+audio_store = AudioStore(
+    AUDIO_STORE_DIR,
+    int(AUDIO_STORE_QUOTA_MB * 2**20),
+    AUDIO_STORE_TTL,
+    archive_dir=AUDIO_ARCHIVE_DIR if ARCHIVE_USER_AUDIO else None,
+)
@@ -0,0 +1,93 @@
+"""
+ASR upload size and latency: raw 44.1 kHz WAV vs. the preprocessed upload.
+
+Uses the fixture answers of streaming_asr_bench.py, padded with the silence
+a recording has before the candidate starts and after they stop. "Before"
+uploads the recording as it was captured (44.1 kHz WAV); "after" goes
+through transcriber.transcribe_audio, which downmixes, resamples to 16 kHz,
+trims silence and encodes as FLAC or Opus. The stand-in backend encodes the
+upload like WhisperAPIBackend, pays for the bytes at the given uplink rate
+and for the audio length like a hosted model, then decodes the tones, so
+transcripts are checked exactly.
+
+    python benchmarks/asr_upload_bench.py --lengths 10 30 60 --uplink-mbps 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import transcriber
+from asr_backends import encode_audio
+from streaming_asr_bench import FS, ToneBackend, fixture_answer
+
+
+class UploadBackend(ToneBackend):
+    """ToneBackend behind an uplink: encodes like WhisperAPIBackend and pays for every byte sent."""
+
+    def __init__(self, fmt, uplink_mbps, **kwargs):
+        super().__init__(**kwargs)
+        self.fmt = fmt
+        self.uplink_mbps = uplink_mbps
+        self.upload_bytes = 0
+
+    def transcribe(self, samples, fs):
+        _, payload = encode_audio(samples, fs, self.fmt)
+        self.upload_bytes += len(payload)
+        time.sleep(len(payload) * 8 / (self.uplink_mbps * 1e6))
+        return super().transcribe(samples, fs)
+
+
+def recording(seconds, lead, tail):
+    """A fixture answer with silence (and a little noise) before and after it."""
+    audio, words = fixture_answer(seconds)
+    rng = np.random.default_rng(1)
+    silence = lambda duration: (rng.normal(0, 0.001, int(duration * FS)) * 32767).astype(np.int16)
+    return np.concatenate([silence(lead), audio, silence(tail)]), words
+
+
+def run(seconds, lead, tail, uplink_mbps):
+    audio, expected = recording(seconds, lead, tail)
+    result = {"answer_seconds": round(len(audio) / FS, 1)}
+
+    # Before: the recording is uploaded as captured
+    backend = UploadBackend("wav", uplink_mbps)
+    started = time.perf_counter()
+    text = backend.transcribe(audio, FS)
+    result["wav_44k"] = {
+        "upload_bytes": backend.upload_bytes,
+        "latency_s": round(time.perf_counter() - started, 3),
+        "exact": text.split() == expected,
+    }
+
+    # After: preprocessed and compressed
+    for fmt in ("flac", "opus"):
+        backend = UploadBackend(fmt, uplink_mbps)
+        transcriber.get_asr_backend = lambda: backend
+        started = time.perf_counter()
+        text = transcriber.transcribe_audio(audio, FS)
+        result[f"{fmt}_16k"] = {
+            "upload_bytes": backend.upload_bytes,
+            "latency_s": round(time.perf_counter() - started, 3),
+            "exact": text.split() == expected,
+        }
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lengths", type=float, nargs="+", default=[10, 30, 60], help="Answer lengths in seconds.")
+    parser.add_argument("--lead", type=float, default=1.0, help="Silence before the answer, in seconds.")
+    parser.add_argument("--tail", type=float, default=1.5, help="Silence after the answer, in seconds.")
+    parser.add_argument("--uplink-mbps", type=float, default=5.0)
+    args = parser.parse_args()
+    # Load scipy's resampler and soundfile up front so the first measurement doesn't pay for the imports
+    transcriber.preprocess_audio(np.zeros(FS, dtype=np.int16), FS)
+    encode_audio(np.zeros(FS, dtype=np.int16), FS, "flac")
+    print(json.dumps([run(seconds, args.lead, args.tail, args.uplink_mbps) for seconds in args.lengths], indent=2))
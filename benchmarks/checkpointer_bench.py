@@ -0,0 +1,84 @@
+"""
+Checkpoint write/read latency per turn: SQLite (WAL) vs. the in-process MemorySaver.
+
+Runs the same scripted interviews (offline scripted LLM, no network) against
+both backends and reports the time spent in the checkpointer per turn.
+
+    python benchmarks/checkpointer_bench.py --interviews 50
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SCREENING_LLM_PROVIDER"] = "scripted"
+os.environ["SCRIPTED_LLM_LATENCY"] = "0"
+
+from langgraph.checkpoint.memory import MemorySaver
+import agent
+import metrics
+from checkpointer import SQLiteCheckpointer
+
+ANSWERS = [
+    "Yes, I am open to relocating.",
+    "Around thirty lakhs per annum.",
+    "I like the data engineering problems Sigmoid works on.",
+    "Yes, a team of four engineers.",
+    "Five years building forecasting and recommendation models in retail.",
+    "I am looking for larger scale problems.",
+]
+
+
+def _time_calls(saver, prefix):
+    """Record the duration of every checkpoint read and write under prefix.*."""
+    for name, metric in (("get_tuple", "get"), ("put", "put"), ("put_writes", "put_writes")):
+        method = getattr(saver, name)
+
+        def timed(*args, _method=method, _metric=f"{prefix}.{metric}", **kwargs):
+            with metrics.timed(_metric):
+                return _method(*args, **kwargs)
+
+        setattr(saver, name, timed)
+    return saver
+
+
+def run(backend, saver, interviews):
+    agent._graph = agent._build_graph(_time_calls(saver, f"bench.{backend}"))
+    turns = 0
+    started = time.perf_counter()
+    for _ in range(interviews):
+        session = agent.InterviewSession()
+        agent.start_interview(session)
+        for answer in ANSWERS:
+            agent.process_with_agent(session, answer)
+            turns += 1
+    elapsed = time.perf_counter() - started
+
+    samples = metrics.summary()["samples"]
+    per_turn = sum(
+        stats["mean"] * stats["count"]
+        for name, stats in samples.items() if name.startswith(f"bench.{backend}.")
+    ) / turns
+    report = {"turns": turns, "checkpoint_ms_per_turn": per_turn * 1000, "turn_ms": elapsed / turns * 1000}
+    for op in ("get", "put", "put_writes"):
+        stats = samples.get(f"bench.{backend}.{op}")
+        if stats:
+            report[f"{op}_p50_ms"] = stats["p50"] * 1000
+            report[f"{op}_p95_ms"] = stats["p95"] * 1000
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--interviews", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {
+            "memory": run("memory", MemorySaver(), args.interviews),
+            "sqlite": run("sqlite", SQLiteCheckpointer(os.path.join(directory, "bench.sqlite")), args.interviews),
+        }
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,63 @@
+"""
+Prompt size per turn with and without history compaction.
+
+Runs one scripted interview (offline scripted LLM, no network) with
+COMPACT_HISTORY=1 and reports, for every turn, the input tokens of the full
+history prompt next to the compacted prompt that was actually sent.
+
+    python benchmarks/compaction_bench.py
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["SCREENING_LLM_PROVIDER"] = "scripted"
+os.environ["SCRIPTED_LLM_LATENCY"] = "0"
+os.environ["SCREENING_ENGINE"] = "llm"
+os.environ["COMPACT_HISTORY"] = "1"
+os.environ["COMPACT_METRICS_SAMPLE_RATE"] = "1"
+
+from langgraph.checkpoint.memory import MemorySaver
+import agent
+import metrics
+
+# Realistic spoken answers, 7-15 words each
+ANSWERS = [
+    "Yes, I am open to relocating to Bangalore with my family.",
+    "I am expecting somewhere between twenty eight and thirty two lakhs per annum.",
+    "I like the scale of the data engineering problems Sigmoid solves for clients.",
+    "Yes, I have led a team of four data scientists for two years.",
+    "Five years building forecasting and recommendation models for large retail and banking clients.",
+    "I want to work on bigger problems and grow into a technical leadership role.",
+]
+
+
+def run():
+    agent._graph = agent._build_graph(MemorySaver())
+    session = agent.InterviewSession()
+    agent.start_interview(session)
+    turns = []
+    for answer in ANSWERS:
+        metrics.reset()
+        agent.process_with_agent(session, answer)
+        samples = metrics.summary()["samples"]
+        full = samples.get("agent.input_tokens.full")
+        compacted = samples.get("agent.input_tokens.compacted")
+        turns.append({
+            "full": full["max"] if full else None,
+            "compacted": compacted["max"] if compacted else None,
+        })
+    measured = [turn for turn in turns if turn["full"] is not None]
+    return {
+        "turns": turns,
+        "full_total": sum(turn["full"] for turn in measured),
+        "compacted_total": sum(turn["compacted"] for turn in measured),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args()
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,96 @@
+"""
+Startup cost per module, from python -X importtime.
+
+Each module is imported in a fresh interpreter, so every number includes
+everything that module pulls in. The heaviest imports underneath it are
+listed too, which shows where a regression came from.
+
+    python benchmarks/import_time.py                      # report
+    python benchmarks/import_time.py --save baseline.json
+    python benchmarks/import_time.py --compare baseline.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# app.py is a Streamlit script (importing it runs the page), so it is measured through its imports
+MODULES = [
+    "agent", "transcriber", "asr_backends", "vad", "tts", "tts_cache", "audio_store",
+    "transcript_pdf", "scoring", "checkpointer", "llm_providers", "resilience", "sentences", "metrics",
+]
+
+
+def import_time(module, repeat=3, top=5):
+    """
+    Measure importing one module in a fresh interpreter.
+
+    Args:
+        module (str): Top-level module name.
+        repeat (int): Runs; the fastest is kept, to filter out noise.
+        top (int): Number of heaviest nested imports to report.
+
+    Returns:
+        dict: seconds (cumulative) and heaviest [(package, seconds)].
+    """
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"importing {module} failed:\n{result.stderr[-2000:]}")
+
+        # Lines come children first, each nesting level indented two more spaces,
+        # so a top-level import's direct children are the level-two lines just before it
+        children, nested, total = {}, {}, None
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            if not cumulative.strip().isdigit():
+                continue  # the header line
+            seconds = int(cumulative) / 1e6
+            depth = (len(name) - len(name.lstrip())) // 2
+            if depth == 0:
+                if name.strip() == module:
+                    total, nested = seconds, children
+                children = {}
+            elif depth == 1:
+                children[name.strip()] = seconds
+        if best is None or total < best["seconds"]:
+            heaviest = sorted(nested.items(), key=lambda item: item[1], reverse=True)[:top]
+            best = {"seconds": total, "heaviest": heaviest}
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report import time per module.")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Show the change against results saved earlier.")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    for module in args.modules:
+        results[module] = import_time(module, args.repeat)
+        seconds = results[module]["seconds"]
+        line = f"{module:<16} {seconds * 1000:8.1f} ms"
+        if module in baseline:
+            line += f"  ({(seconds - baseline[module]['seconds']) * 1000:+.1f} ms)"
+        heaviest = ", ".join(f"{name} {value * 1000:.0f}" for name, value in results[module]["heaviest"])
+        print(f"{line}   heaviest: {heaviest}")
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
@@ -0,0 +1,116 @@
+"""
+Transcript PDF cost with long transcripts: the old per-rerun rebuild vs.
+TranscriptPDF.build.
+
+Before, the sidebar rebuilt the whole PDF on every rerun; now reruns build
+nothing and the PDF is built when the export is clicked, reusing the turns
+already parsed. Reports the PDF work per rerun for both, and the cost of
+exports with TranscriptPDF.
+
+    python benchmarks/pdf_bench.py --turns 200
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transcript_pdf import TranscriptPDF
+
+QUESTION = "Could you tell me about your professional experience and the kind of work you have done in past roles?"
+ANSWER = ("I have spent five years building forecasting and recommendation models for retail "
+          "and banking clients, mostly in Python and Spark, and I led a team of four for the last two.")
+
+
+def transcript(turns):
+    return [{"role": "assistant" if i % 2 == 0 else "user", "content": QUESTION if i % 2 == 0 else ANSWER}
+            for i in range(turns)]
+
+
+def baseline_pdf(history):
+    """The sidebar's generate_pdf before TranscriptPDF, run on every rerun."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib.enums import TA_CENTER
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+                          rightMargin=72, leftMargin=72,
+                          topMargin=72, bottomMargin=18)
+    elements = []
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=24,
+                                 textColor='#1f2937', spaceAfter=30, alignment=TA_CENTER)
+    heading_style = ParagraphStyle('CustomHeading', parent=styles['Heading2'], fontSize=14,
+                                   textColor='#374151', spaceAfter=12, spaceBefore=12)
+    normal_style = ParagraphStyle('CustomNormal', parent=styles['Normal'], fontSize=11,
+                                  textColor='#1f2937', spaceAfter=8)
+    role_style = ParagraphStyle('RoleStyle', parent=styles['Normal'], fontSize=12,
+                                textColor='#0284c7', fontName='Helvetica-Bold', spaceAfter=4)
+
+    elements.append(Paragraph("SIGMOID AI CANDIDATE SCREENING", title_style))
+    elements.append(Spacer(1, 0.2*inch))
+    elements.append(Paragraph("Interview Details", heading_style))
+    elements.append(Paragraph(f"<b>Job Role:</b> Data Scientist", normal_style))
+    elements.append(Paragraph(f"<b>Interview Type:</b> HR Screening", normal_style))
+    elements.append(Paragraph(f"<b>Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", normal_style))
+    elements.append(Spacer(1, 0.3*inch))
+    elements.append(Paragraph("Conversation Transcript", heading_style))
+    elements.append(Spacer(1, 0.2*inch))
+    for msg in history:
+        role = "CANDIDATE" if msg["role"] == "user" else "INTERVIEWER"
+        elements.append(Paragraph(f"{role}:", role_style))
+        content = msg['content'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+        elements.append(Paragraph(content, normal_style))
+        elements.append(Spacer(1, 0.15*inch))
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer
+
+
+def _seconds(fn, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat
+
+
+def run(turns, repeat):
+    history = transcript(turns)
+    baseline_pdf(history[:2])   # import reportlab outside the timings
+
+    before = _seconds(lambda: baseline_pdf(history), repeat)
+    pdf = TranscriptPDF()
+    # What the sidebar does on a rerun now: snapshot the history for the deferred build
+    after = _seconds(lambda: (lambda snapshot=list(history): pdf.build(snapshot, 1)), repeat)
+
+    started = time.perf_counter()
+    pdf.build(history[:-2], 1)
+    first_export = time.perf_counter() - started
+    started = time.perf_counter()
+    pdf.build(history, 2)
+    export_after_new_turns = time.perf_counter() - started
+    repeat_export = _seconds(lambda: pdf.build(history, 2), repeat)
+
+    return {
+        "turns": turns,
+        "before_pdf_ms_per_rerun": before * 1000,
+        "after_pdf_ms_per_rerun": after * 1000,
+        "after_first_export_ms": first_export * 1000,
+        "after_export_after_2_new_turns_ms": export_after_new_turns * 1000,
+        "after_repeat_export_ms": repeat_export * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps(run(args.turns, args.repeat), indent=2))
@@ -0,0 +1,119 @@
+"""
+Player payload and render time per rerun over a full interview.
+
+Drives app.py through a whole scripted interview with Streamlit's AppTest
+(offline scripted LLM; synthesized speech is replaced by clips of a fixed
+size and latency, no network) and reports, per script run, how many bytes
+the robot player receives: media URLs now, against the base64 data URIs
+it used to receive for the same audio. Render time is the script's own
+app.rerun_seconds.
+
+    python benchmarks/rerun_payload_bench.py --clip-kb 40
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.update(
+    SCREENING_LLM_PROVIDER="scripted",
+    SCRIPTED_LLM_LATENCY="0.2",
+    CHECKPOINT_BACKEND="memory",
+    PREWARM_GREETING="0",
+    AUTO_ENDPOINT="0",
+    TTS_CACHE_DISK_MB="0",
+)
+
+import metrics
+import tts
+from streamlit.components.v1.custom_component import CustomComponent
+from streamlit.testing.v1 import AppTest
+
+ANSWERS = [
+    "Yes, I am open to relocating to Bangalore with my family.",
+    "I am expecting somewhere between twenty eight and thirty two lakhs per annum.",
+    "I like the scale of the data engineering problems Sigmoid solves for clients.",
+    "Yes, I have led a team of four data scientists for two years.",
+    "Five years building forecasting and recommendation models for large retail and banking clients.",
+    "I want to work on bigger problems and grow into a technical leadership role.",
+]
+
+
+def _fake_speech(clip_bytes, latency):
+    async def generate(text):
+        await asyncio.sleep(latency)
+        # Distinct content per sentence, like real audio
+        return memoryview((text.encode() * (clip_bytes // len(text) + 1))[:clip_bytes]).toreadonly()
+    return generate
+
+
+def _capture(renders, rerun_seconds):
+    """Record the segments handed to every player render, and every script run's duration."""
+    call = CustomComponent.__call__
+
+    def render(self, *args, **kwargs):
+        if self.name.endswith("robot_player"):
+            renders.append(list(kwargs["segments"]))
+        return call(self, *args, **kwargs)
+
+    record = metrics.record
+
+    def record_sample(name, value):
+        if name == "app.rerun_seconds":
+            rerun_seconds.append(value)
+        record(name, value)
+
+    CustomComponent.__call__ = render
+    metrics.record = record_sample
+
+
+def run(clip_kb, tts_latency, poll):
+    clip_bytes = int(clip_kb * 1024)
+    tts._generate_speech = _fake_speech(clip_bytes, tts_latency)
+    # Every clip has the same size, so so has its data URI
+    data_uri_bytes = len(f"data:{tts.TTS_MIME_TYPE};base64,") + len(base64.b64encode(bytes(clip_bytes)))
+    renders, rerun_seconds = [], []
+    _capture(renders, rerun_seconds)
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.run()
+    at.button[0].click().run()
+    for answer in ANSWERS:
+        # Stand in for a recorded, transcribed answer
+        at.session_state["conversation_history"].append({"role": "user", "content": answer})
+        at.session_state["history_version"] += 1
+        at.session_state["processing"] = True
+        at.session_state["audio_processed"] = True
+        at.run()
+        # AppTest does not run fragment timers; poll at the panel's interval instead
+        while at.session_state["pending_speech"] or at.session_state["reply_stream"] is not None:
+            time.sleep(poll)
+            at.run()
+
+    url_bytes = [sum(len(url) for url in segments) for segments in renders]
+    return {
+        "completed_runs": len(rerun_seconds),
+        "render_ms_mean": sum(rerun_seconds) / len(rerun_seconds) * 1000,
+        "render_ms_p95": sorted(rerun_seconds)[int(0.95 * (len(rerun_seconds) - 1))] * 1000,
+        "player_renders": len(renders),
+        "url_payload_bytes_mean": sum(url_bytes) / len(renders),
+        "url_payload_bytes_max": max(url_bytes),
+        "data_uri_payload_bytes_mean": sum(len(segments) for segments in renders) * data_uri_bytes / len(renders),
+        "data_uri_payload_bytes_max": max(len(segments) for segments in renders) * data_uri_bytes,
+        "interview_finished": not at.session_state["interview_active"],
+        "exceptions": [str(exception) for exception in at.exception],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clip-kb", type=float, default=40, help="Size of each synthesized sentence")
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="Seconds per synthesized sentence")
+    parser.add_argument("--poll", type=float, default=0.1, help="Seconds between runs while speech is delivered")
+    args = parser.parse_args()
+    print(json.dumps(run(args.clip_kb, args.tts_latency, args.poll), indent=2))
@@ -0,0 +1,135 @@
+"""
+Time from "Stop" to transcript for long answers: streaming segments vs. one upload.
+
+The fixture answers are synthetic: each word is a short tone whose pitch
+encodes the word, with short gaps between words and longer pauses between
+sentences. A stand-in ASR backend decodes the tones back into words and
+takes time proportional to the audio it receives, like a hosted model, so
+the benchmark needs no network and checks the stitched transcript exactly.
+
+Audio is fed --speedup times faster than real time to keep the run short;
+backend latency and the reported times are real seconds. Feeding faster only
+gives the background segments less time to finish, so streaming results are
+if anything pessimistic.
+
+    python benchmarks/streaming_asr_bench.py --lengths 30 60 120
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transcriber
+
+FS = 44100
+BLOCK = 1024
+WORD_SECONDS, GAP_SECONDS, PAUSE_SECONDS = 0.35, 0.12, 0.6
+WORDS_PER_SENTENCE = 9
+VOCABULARY = 32
+BASE_HZ, STEP_HZ = 300.0, 25.0
+
+
+def fixture_answer(seconds, pauses=True, seed=0):
+    """
+    Build a synthetic answer of about the given length. Without pauses the
+    answer is one run-on sentence, so segments are cut at the maximum length.
+
+    Returns:
+        tuple: (int16 audio at FS, list of the words spoken)
+    """
+    rng = np.random.default_rng(seed)
+    pieces, words, elapsed = [], [], 0.0
+    while elapsed < seconds:
+        for _ in range(WORDS_PER_SENTENCE):
+            index = int(rng.integers(VOCABULARY))
+            t = np.arange(int(WORD_SECONDS * FS)) / FS
+            pieces.append(0.3 * np.sin(2 * np.pi * (BASE_HZ + STEP_HZ * index) * t))
+            pieces.append(np.zeros(int(GAP_SECONDS * FS)))
+            words.append(f"w{index}")
+        pause = PAUSE_SECONDS if pauses else 0.0
+        pieces.append(np.zeros(int(pause * FS)))
+        elapsed += WORDS_PER_SENTENCE * (WORD_SECONDS + GAP_SECONDS) + pause
+    audio = np.concatenate(pieces) + rng.normal(0, 0.001, sum(len(piece) for piece in pieces))
+    return (audio * 32767).astype(np.int16), words
+
+
+class ToneBackend:
+    """Decodes fixture tones into words, with latency like a hosted model."""
+
+    def __init__(self, base_latency=0.4, seconds_per_audio_second=0.05):
+        self.base_latency = base_latency
+        self.seconds_per_audio_second = seconds_per_audio_second
+        self.calls = 0
+
+    def transcribe(self, samples, fs):
+        self.calls += 1
+        duration = len(samples) / fs
+        time.sleep(self.base_latency + self.seconds_per_audio_second * duration)
+
+        # Voiced runs of 10 ms frames, one word each; the dominant pitch names the word
+        frame = fs // 100
+        usable = len(samples) // frame * frame
+        levels = np.sqrt(np.mean(((samples[:usable].astype(np.float32) / 32768) ** 2).reshape(-1, frame), axis=1))
+        voiced = levels > 0.05
+        words, start = [], None
+        for i, is_voiced in enumerate(np.append(voiced, False)):
+            if is_voiced and start is None:
+                start = i
+            elif not is_voiced and start is not None:
+                run = samples[start * frame:i * frame].astype(np.float32)
+                spectrum = np.abs(np.fft.rfft(run, n=max(len(run), fs)))
+                pitch = np.argmax(spectrum) * fs / max(len(run), fs)
+                words.append(f"w{int(round((pitch - BASE_HZ) / STEP_HZ))}")
+                start = None
+        return " ".join(words)
+
+
+def run(seconds, pauses, speedup):
+    audio, expected = fixture_answer(seconds, pauses)
+    backend = ToneBackend()
+    transcriber.get_asr_backend = lambda: backend
+
+    # Batch: the whole answer is uploaded after Stop
+    started = time.perf_counter()
+    batch_text = transcriber.transcribe_audio(audio, FS)
+    batch_latency = time.perf_counter() - started
+
+    # Streaming: segments are transcribed while the answer is being "recorded"
+    backend.calls = 0
+    streaming = transcriber.StreamingTranscriber(FS)
+    block_seconds = BLOCK / FS / speedup
+    clock = time.perf_counter()
+    for offset in range(0, len(audio), BLOCK):
+        streaming.feed(audio[offset:offset + BLOCK])
+        clock += block_seconds
+        time.sleep(max(0.0, clock - time.perf_counter()))
+    started = time.perf_counter()
+    streaming_text = streaming.finish()
+    streaming_latency = time.perf_counter() - started
+
+    return {
+        "answer_seconds": round(len(audio) / FS, 1),
+        "pauses": pauses,
+        "words": len(expected),
+        "batch_stop_to_text_s": round(batch_latency, 3),
+        "streaming_stop_to_text_s": round(streaming_latency, 3),
+        "streaming_segments": backend.calls,
+        "batch_exact": batch_text.split() == expected,
+        "streaming_exact": streaming_text.split() == expected,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark streaming transcription on long fixture answers.")
+    parser.add_argument("--lengths", type=float, nargs="+", default=[30, 60, 120], help="Answer lengths in seconds.")
+    parser.add_argument("--speedup", type=float, default=10.0)
+    args = parser.parse_args()
+    # Load scipy's resampler up front so the first measurement doesn't pay for the import
+    transcriber.preprocess_audio(np.zeros(FS, dtype=np.int16), FS)
+    results = [run(seconds, pauses, args.speedup) for seconds in args.lengths for pauses in (True, False)]
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,258 @@
+import asyncio
+import os
+import sqlite3
+import threading
+from langgraph.checkpoint.base import BaseCheckpointSaver, CheckpointTuple, WRITES_IDX_MAP
+from langgraph.checkpoint.memory import MemorySaver
+from dotenv import load_dotenv
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB", "checkpoints.sqlite")
+CHECKPOINT_ARCHIVE = os.getenv("CHECKPOINT_ARCHIVE", "1") == "1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns)
+);
+CREATE TABLE IF NOT EXISTS writes (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    channel TEXT NOT NULL,
+    type TEXT,
+    value BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns, checkpoint_id, task_id, idx)
+);
+CREATE TABLE IF NOT EXISTS archived_checkpoints (
+    thread_id TEXT NOT NULL,
+    checkpoint_ns TEXT NOT NULL DEFAULT '',
+    checkpoint_id TEXT NOT NULL,
+    parent_checkpoint_id TEXT,
+    type TEXT,
+    checkpoint BLOB,
+    metadata_type TEXT,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, checkpoint_ns)
+);
+"""
+
+
+def _is_finished(checkpoint):
+    """Return True if the checkpoint belongs to an interview that has stopped."""
+    control = checkpoint.get("channel_values", {}).get("control") or {}
+    return control.get("decision") == "stop"
+
+
+class SQLiteCheckpointer(BaseCheckpointSaver):
+    """
+    Bounded, durable LangGraph checkpointer backed by SQLite in WAL mode.
+
+    Only the latest checkpoint of each thread is kept. When an interview
+    finishes (control["decision"] == "stop") its checkpoint is moved to an
+    archive table (or dropped if archiving is disabled), so the live tables
+    stay small.
+    """
+
+    def __init__(self, path=CHECKPOINT_DB, archive=CHECKPOINT_ARCHIVE, *, serde=None):
+        super().__init__(serde=serde)
+        self.path = path
+        self.archive = archive
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        # One connection per thread; WAL lets readers and the writer overlap
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _row_to_tuple(self, row, thread_id, checkpoint_ns, pending_writes):
+        checkpoint_id, parent_id, type_, checkpoint, metadata_type, metadata = row
+        config = {"configurable": {
+            "thread_id": thread_id,
+            "checkpoint_ns": checkpoint_ns,
+            "checkpoint_id": checkpoint_id,
+        }}
+        parent_config = None
+        if parent_id:
+            parent_config = {"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": parent_id,
+            }}
+        return CheckpointTuple(
+            config=config,
+            checkpoint=self.serde.loads_typed((type_, checkpoint)),
+            metadata=self.serde.loads_typed((metadata_type, metadata)),
+            parent_config=parent_config,
+            pending_writes=pending_writes,
+        )
+
+    def get_tuple(self, config):
+        with metrics.timed("checkpoint.get"):
+            configurable = config["configurable"]
+            thread_id = configurable["thread_id"]
+            checkpoint_ns = configurable.get("checkpoint_ns", "")
+            wanted_id = configurable.get("checkpoint_id")
+            conn = self._conn()
+
+            columns = "checkpoint_id, parent_checkpoint_id, type, checkpoint, metadata_type, metadata"
+            row = conn.execute(
+                f"SELECT {columns} FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+                (thread_id, checkpoint_ns),
+            ).fetchone()
+            if row is None:
+                # Finished interviews can still be read back from the archive
+                row = conn.execute(
+                    f"SELECT {columns} FROM archived_checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+                    (thread_id, checkpoint_ns),
+                ).fetchone()
+            if row is None or (wanted_id and row[0] != wanted_id):
+                return None
+
+            writes = conn.execute(
+                "SELECT task_id, channel, type, value FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? ORDER BY task_id, idx",
+                (thread_id, checkpoint_ns, row[0]),
+            ).fetchall()
+            pending_writes = [
+                (task_id, channel, self.serde.loads_typed((type_, value)))
+                for task_id, channel, type_, value in writes
+            ]
+            return self._row_to_tuple(row, thread_id, checkpoint_ns, pending_writes)
+
+    def list(self, config, *, filter=None, before=None, limit=None):
+        conn = self._conn()
+        query = "SELECT thread_id, checkpoint_ns FROM checkpoints"
+        params = ()
+        if config is not None:
+            query += " WHERE thread_id = ?"
+            params = (config["configurable"]["thread_id"],)
+
+        count = 0
+        for thread_id, checkpoint_ns in conn.execute(query, params).fetchall():
+            item = self.get_tuple({"configurable": {"thread_id": thread_id, "checkpoint_ns": checkpoint_ns}})
+            if item is None:
+                continue
+            if before is not None and item.config["configurable"]["checkpoint_id"] >= before["configurable"]["checkpoint_id"]:
+                continue
+            if filter and any(item.metadata.get(key) != value for key, value in filter.items()):
+                continue
+            yield item
+            count += 1
+            if limit is not None and count >= limit:
+                return
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        with metrics.timed("checkpoint.put"):
+            configurable = config["configurable"]
+            thread_id = configurable["thread_id"]
+            checkpoint_ns = configurable.get("checkpoint_ns", "")
+            type_, blob = self.serde.dumps_typed(checkpoint)
+            metadata_type, metadata_blob = self.serde.dumps_typed(metadata)
+            row = (thread_id, checkpoint_ns, checkpoint["id"], configurable.get("checkpoint_id"),
+                   type_, blob, metadata_type, metadata_blob)
+
+            conn = self._conn()
+            with conn:
+                if _is_finished(checkpoint):
+                    if self.archive:
+                        conn.execute("INSERT OR REPLACE INTO archived_checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+                    conn.execute("DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?",
+                                 (thread_id, checkpoint_ns))
+                    conn.execute("DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ?",
+                                 (thread_id, checkpoint_ns))
+                    metrics.incr("checkpoint.archived" if self.archive else "checkpoint.evicted")
+                else:
+                    conn.execute("INSERT OR REPLACE INTO checkpoints VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+                    # Writes belonging to older checkpoints have already been applied
+                    conn.execute(
+                        "DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id != ?",
+                        (thread_id, checkpoint_ns, checkpoint["id"]),
+                    )
+
+            return {"configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }}
+
+    def put_writes(self, config, writes, task_id, task_path=""):
+        configurable = config["configurable"]
+        thread_id = configurable["thread_id"]
+        checkpoint_ns = configurable.get("checkpoint_ns", "")
+        checkpoint_id = configurable["checkpoint_id"]
+        # Special channels (errors, interrupts) overwrite; regular writes are first-wins
+        verb = "INSERT OR REPLACE" if all(channel in WRITES_IDX_MAP for channel, _ in writes) else "INSERT OR IGNORE"
+
+        rows = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, blob = self.serde.dumps_typed(value)
+            rows.append((thread_id, checkpoint_ns, checkpoint_id, task_id,
+                         WRITES_IDX_MAP.get(channel, idx), channel, type_, blob))
+
+        conn = self._conn()
+        with conn:
+            conn.executemany(f"{verb} INTO writes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+
+    def delete_thread(self, thread_id):
+        conn = self._conn()
+        with conn:
+            for table in ("checkpoints", "writes", "archived_checkpoints"):
+                conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+
+
+    # Async API: run the (fast, local) SQLite calls on worker threads so
+    # graph.ainvoke never blocks the event loop
+    async def aget_tuple(self, config):
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None):
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        return await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id):
+        return await asyncio.to_thread(self.delete_thread, thread_id)
+
+
+def make_checkpointer(backend=CHECKPOINT_BACKEND):
+    """
+    Build the checkpointer selected by configuration.
+
+    Args:
+        backend (str): "sqlite" (durable, bounded) or "memory" (in-process MemorySaver).
+
+    Returns:
+        BaseCheckpointSaver: The checkpointer instance.
+    """
+    if backend == "memory":
+        return MemorySaver()
+    if backend == "sqlite":
+        return SQLiteCheckpointer()
+    raise ValueError(f"Unknown CHECKPOINT_BACKEND '{backend}'. Use 'sqlite' or 'memory'.")
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+import uuid
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Offline, deterministic stand-in for the screening LLM.
+
+    It only answers forced tool calls (which is how with_structured_output and
+    bind_tools use the model): the requested tool's name selects a responder
+    function that maps the message list to the tool arguments. An artificial
+    latency can be configured to make throughput measurements realistic.
+    """
+
+    responders: dict
+    latency: float = 0.0
+    stream_chunk_chars: int = 8
+
+    @property
+    def _llm_type(self):
+        return "scripted"
+
+    def bind_tools(self, tools, *, tool_choice=None, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], tool_choice=tool_choice, **kwargs)
+
+    def get_num_tokens(self, text):
+        # Rough estimate; avoids pulling in a tokenizer for an offline backend
+        return max(1, len(text) // 4)
+
+    def _respond(self, messages, tools):
+        if not tools:
+            raise ValueError("ScriptedChatModel only supports structured output / tool calls.")
+        name = tools[0]["function"]["name"]
+        if name not in self.responders:
+            raise ValueError(f"No scripted responder for tool '{name}'.")
+        args = self.responders[name](messages)
+        input_tokens = sum(self.get_num_tokens(str(message.content)) for message in messages)
+        usage = {
+            "input_tokens": input_tokens,
+            "output_tokens": self.get_num_tokens(json.dumps(args)),
+            "total_tokens": input_tokens + self.get_num_tokens(json.dumps(args)),
+        }
+        return name, args, usage
+
+    def _message(self, messages, tools):
+        name, args, usage = self._respond(messages, tools)
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": name, "args": args, "id": f"call_{uuid.uuid4().hex[:12]}"}],
+            usage_metadata=usage,
+        )
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, tools))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=self._message(messages, tools))])
+
+    def _stream(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        name, args, usage = self._respond(messages, tools)
+        payload = json.dumps(args)
+        pieces = [payload[i:i + self.stream_chunk_chars] for i in range(0, len(payload), self.stream_chunk_chars)]
+        call_id = f"call_{uuid.uuid4().hex[:12]}"
+        for i, piece in enumerate(pieces):
+            time.sleep(self.latency / len(pieces))
+            chunk = AIMessageChunk(
+                content="",
+                tool_call_chunks=[{
+                    "name": name if i == 0 else None,
+                    "args": piece,
+                    "id": call_id if i == 0 else None,
+                    "index": 0,
+                }],
+                usage_metadata=usage if i == len(pieces) - 1 else None,
+            )
+            if run_manager:
+                run_manager.on_llm_new_token("", chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+
+
+def make_chat_model(provider, *, model, api_key=None, timeout=None, responders=None, latency=0.0):
+    """
+    Build the chat model for the configured provider.
+
+    Args:
+        provider (str): "openai" or "scripted".
+        model (str): Model name (OpenAI only).
+        api_key (str): OpenAI API key (OpenAI only).
+        timeout (float): Per-request timeout in seconds (OpenAI only).
+        responders (dict): Tool name -> function(messages) -> args (scripted only).
+        latency (float): Artificial latency per call in seconds (scripted only).
+
+    Returns:
+        BaseChatModel: The chat model.
+    """
+    if provider == "openai":
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
+        from langchain_openai import ChatOpenAI
+        # Retries are handled by the caller's call policy, so the client itself never retries
+        return ChatOpenAI(model=model, api_key=api_key, temperature=0, stream_usage=True,
+                          timeout=timeout, max_retries=0)
+    if provider == "scripted":
+        return ScriptedChatModel(responders=responders or {}, latency=latency)
+    raise ValueError(f"Unknown SCREENING_LLM_PROVIDER '{provider}'. Use 'openai' or 'scripted'.")
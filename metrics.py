@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+# Keep a bounded window of samples per metric so memory stays flat
+MAX_SAMPLES = 1000
+
+_lock = threading.Lock()
+_samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+_counters = defaultdict(int)
+
+
+def record(name, value):
+    """
+    Record one sample (e.g. a latency in seconds or a byte count).
+
+    Args:
+        name (str): Metric name, e.g. "checkpoint.put".
+        value (float): The sample value.
+    """
+    with _lock:
+        _samples[name].append(value)
+
+
+def incr(name, amount=1):
+    """
+    Increment a counter.
+
+    Args:
+        name (str): Counter name.
+        amount (int): Amount to add.
+    """
+    with _lock:
+        _counters[name] += amount
+
+
+@contextmanager
+def timed(name):
+    """
+    Record the wall-clock duration of the wrapped block in seconds.
+
+    Args:
+        name (str): Metric name.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def count(name):
+    """
+    Return the number of samples currently held for a metric.
+    """
+    with _lock:
+        return len(_samples.get(name, ()))
+
+
+def percentile(name, pct):
+    """
+    Return the given percentile of a metric, or None if it has no samples.
+    """
+    with _lock:
+        values = list(_samples.get(name, ()))
+    if not values:
+        return None
+    return _percentile(values, pct)
+
+
+def summary():
+    """
+    Summarize every recorded metric.
+
+    Returns:
+        dict: {"samples": {name: {count, mean, p50, p95, max}}, "counters": {name: value}}
+    """
+    with _lock:
+        samples = {name: list(values) for name, values in _samples.items()}
+        counters = dict(_counters)
+
+    stats = {}
+    for name, values in samples.items():
+        if not values:
+            continue
+        stats[name] = {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": _percentile(values, 50),
+            "p95": _percentile(values, 95),
+            "max": max(values),
+        }
+    return {"samples": stats, "counters": counters}
+
+
+def reset():
+    """Drop all recorded samples and counters."""
+    with _lock:
+        _samples.clear()
+        _counters.clear()
@@ -0,0 +1,296 @@
+import asyncio
+import contextvars
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dotenv import load_dotenv
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+# Threads per stage that run sync attempts, so they can be abandoned at the deadline
+# or hedged. Abandoned attempts hold a worker until they return, so size this for the
+# number of concurrent turns plus their hedges; <STAGE>_POLICY_WORKERS overrides it.
+CALL_POLICY_WORKERS = int(os.getenv("CALL_POLICY_WORKERS", "64"))
+
+# Every policy created, by stage name, for reporting
+_policies = {}
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a stage's circuit breaker is open and calls fail fast."""
+
+
+def _is_retryable(exc):
+    """Client errors (bad request, auth, ...) will not succeed on retry."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+    status = getattr(exc, "status_code", None)
+    if status is not None and 400 <= status < 500 and status not in (408, 409, 429):
+        return False
+    return True
+
+
+class CallPolicy:
+    """
+    Latency budget and failure handling for one stage of a turn (LLM, ASR, TTS).
+
+    A call gets an overall deadline shared by all its attempts, jittered
+    exponential-backoff retries, an optional hedged duplicate request once an
+    attempt runs longer than the stage's observed p95, and a circuit breaker
+    that fails fast after repeated failures.
+
+    Sync attempts run on a thread pool owned by the stage, so a slow stage
+    cannot starve the others. With no deadline (timeout=None) and no hedging
+    they run inline on the caller's thread.
+
+    A hedge can double the billed calls, so hedging is off unless the stage
+    turns it on: hedge=None reads <STAGE>_HEDGE=1 from the environment.
+    """
+
+    def __init__(self, stage, timeout, retries=2, backoff=0.25, hedge=None,
+                 hedge_percentile=95, min_hedge_samples=20, failure_threshold=5, reset_after=30.0,
+                 workers=None):
+        self.stage = stage
+        self.timeout = timeout
+        self.workers = workers or int(os.getenv(f"{stage.upper()}_POLICY_WORKERS", CALL_POLICY_WORKERS))
+        self._pool = None
+        self.retries = retries
+        self.backoff = backoff
+        self.hedge = hedge if hedge is not None else os.getenv(f"{stage.upper()}_HEDGE", "0") == "1"
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_samples = min_hedge_samples
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+        _policies[stage] = self
+
+    # Circuit breaker
+
+    def _check_circuit(self):
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self.reset_after:
+                metrics.incr(f"{self.stage}.short_circuited")
+                raise CircuitOpenError(f"{self.stage} circuit is open after repeated failures")
+            # Half-open: let this call through as a trial
+            self._opened_at = None
+
+    def _record_latency(self, started):
+        # Per successful attempt, so retries and backoff never inflate the hedge threshold
+        metrics.record(f"{self.stage}.latency", time.monotonic() - started)
+
+    def _record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def _record_failure(self):
+        metrics.incr(f"{self.stage}.failures")
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                metrics.incr(f"{self.stage}.circuit_opened")
+
+    # Helpers
+
+    def _hedge_delay(self):
+        if not self.hedge:
+            return None
+        if metrics.count(f"{self.stage}.latency") < self.min_hedge_samples:
+            return None
+        return metrics.percentile(f"{self.stage}.latency", self.hedge_percentile)
+
+    def _sleep_time(self, attempt):
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+
+    def _remaining(self, started):
+        # None when the stage has no deadline
+        if self.timeout is None:
+            return None
+        return self.timeout - (time.monotonic() - started)
+
+    def _get_pool(self):
+        # Created on first use, so stages that only make async calls never start threads
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix=f"{self.stage}-policy")
+        return self._pool
+
+    # Sync API
+
+    def _attempt(self, fn, args, kwargs, remaining, hedge):
+        hedge_after = self._hedge_delay() if hedge else None
+        if remaining is None and hedge_after is None:
+            # Nothing to abandon or race, so no need for a worker thread
+            started = time.monotonic()
+            result = fn(*args, **kwargs)
+            self._record_latency(started)
+            return result
+
+        # Copy the context so callbacks such as LangGraph's stream writer still work
+        pool = self._get_pool()
+        started_at = {}
+
+        def submit():
+            future = pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+            started_at[future] = time.monotonic()
+            return future
+
+        deadline = time.monotonic() + (remaining if remaining is not None else float("inf"))
+        futures = [submit()]
+
+        if hedge_after is not None and (remaining is None or hedge_after < remaining):
+            done, _ = wait(futures, timeout=hedge_after)
+            if not done:
+                metrics.incr(f"{self.stage}.hedges")
+                futures.append(submit())
+
+        error = None
+        while futures:
+            timeout = None if remaining is None else max(0.0, deadline - time.monotonic())
+            done, pending = wait(futures, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    for other in pending:
+                        other.cancel()
+                    self._record_latency(started_at[future])
+                    return future.result()
+                error = future.exception()
+            futures = list(pending)
+
+        if error is not None:
+            raise error
+        metrics.incr(f"{self.stage}.timeouts")
+        raise TimeoutError(f"{self.stage} call exceeded its {self.timeout}s budget")
+
+    def call(self, fn, *args, idempotent=True, **kwargs):
+        """
+        Run a blocking call under this policy.
+
+        Args:
+            fn (callable): The call to make.
+            idempotent (bool): False disables retries and hedging, e.g. for
+                streaming calls whose partial output has side effects.
+
+        Returns:
+            The call's result.
+        """
+        self._check_circuit()
+        started = time.monotonic()
+        retries = self.retries if idempotent else 0
+        for attempt in range(retries + 1):
+            remaining = self._remaining(started)
+            try:
+                result = self._attempt(fn, args, kwargs, remaining, hedge=idempotent)
+                self._record_success()
+                return result
+            except Exception as e:
+                remaining = self._remaining(started)
+                if attempt == retries or not _is_retryable(e) or (remaining is not None and remaining <= 0):
+                    self._record_failure()
+                    raise
+                metrics.incr(f"{self.stage}.retries")
+                time.sleep(min(self._sleep_time(attempt), remaining if remaining is not None else float("inf")))
+
+    # Async API
+
+    async def _aattempt(self, fn, args, kwargs, remaining, hedge):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (remaining if remaining is not None else float("inf"))
+        started_at = {}
+
+        def submit():
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+            started_at[task] = time.monotonic()
+            return task
+
+        tasks = [submit()]
+
+        hedge_after = self._hedge_delay() if hedge else None
+        if hedge_after is not None and (remaining is None or hedge_after < remaining):
+            done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+            if not done:
+                metrics.incr(f"{self.stage}.hedges")
+                tasks.append(submit())
+
+        error = None
+        try:
+            while tasks:
+                timeout = None if remaining is None else max(0.0, deadline - loop.time())
+                done, pending = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                for task in done:
+                    if task.exception() is None:
+                        self._record_latency(started_at[task])
+                        return task.result()
+                    error = task.exception()
+                tasks = list(pending)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        if error is not None:
+            raise error
+        metrics.incr(f"{self.stage}.timeouts")
+        raise TimeoutError(f"{self.stage} call exceeded its {self.timeout}s budget")
+
+    async def acall(self, fn, *args, idempotent=True, **kwargs):
+        """
+        Await a coroutine function under this policy.
+
+        Args:
+            fn (callable): Coroutine function to call; it is called again for
+                each retry or hedge.
+            idempotent (bool): False disables retries and hedging.
+
+        Returns:
+            The coroutine's result.
+        """
+        self._check_circuit()
+        started = time.monotonic()
+        retries = self.retries if idempotent else 0
+        for attempt in range(retries + 1):
+            remaining = self._remaining(started)
+            try:
+                result = await self._aattempt(fn, args, kwargs, remaining, hedge=idempotent)
+                self._record_success()
+                return result
+            except Exception as e:
+                remaining = self._remaining(started)
+                if attempt == retries or not _is_retryable(e) or (remaining is not None and remaining <= 0):
+                    self._record_failure()
+                    raise
+                metrics.incr(f"{self.stage}.retries")
+                await asyncio.sleep(min(self._sleep_time(attempt), remaining if remaining is not None else float("inf")))
+
+
+def stage_stats():
+    """
+    Report retry, hedge and failure counts per stage.
+
+    Returns:
+        dict: {stage: {"retries", "hedges", "timeouts", "failures", "circuit_open"}}
+    """
+    counters = metrics.summary()["counters"]
+    return {
+        stage: {
+            "retries": counters.get(f"{stage}.retries", 0),
+            "hedges": counters.get(f"{stage}.hedges", 0),
+            "timeouts": counters.get(f"{stage}.timeouts", 0),
+            "failures": counters.get(f"{stage}.failures", 0),
+            "circuit_open": policy._opened_at is not None,
+        }
+        for stage, policy in _policies.items()
+    }
@@ -0,0 +1,227 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from langchain_core.messages import SystemMessage, HumanMessage
+from typing_extensions import Annotated, TypedDict
+from dotenv import load_dotenv
+from llm_providers import make_chat_model
+from resilience import CallPolicy
+import metrics
+
+# Load environment variables
+load_dotenv()
+
+TRANSCRIPT_QUEUE_DIR = os.getenv("TRANSCRIPT_QUEUE_DIR", "transcripts/queue")
+SCORES_PATH = os.getenv("SCORES_PATH", "transcripts/scores.jsonl")
+SCORING_PROVIDER = os.getenv("SCORING_PROVIDER", os.getenv("SCREENING_LLM_PROVIDER", "openai"))
+SCORING_MODEL = os.getenv("SCORING_MODEL", "gpt-4o-mini")
+SCORING_CONCURRENCY = int(os.getenv("SCORING_CONCURRENCY", "8"))
+SCORING_TIMEOUT = float(os.getenv("SCORING_TIMEOUT", "60"))
+# USD per million tokens, for the cost report
+SCORING_INPUT_PRICE = float(os.getenv("SCORING_INPUT_PRICE", "0.15"))
+SCORING_OUTPUT_PRICE = float(os.getenv("SCORING_OUTPUT_PRICE", "0.60"))
+
+scoring_policy = CallPolicy("scoring", timeout=SCORING_TIMEOUT)
+
+
+class CandidateProfile(TypedDict):
+    """
+    Structured fields extracted from a finished screening interview.
+    """
+
+    open_to_relocation: Annotated[str, "'yes', 'no' or 'unclear' for relocating to Bangalore."]
+    expected_compensation: Annotated[str, "The compensation figure or range the candidate gave, verbatim; empty if none."]
+    has_led_team: Annotated[str, "'yes', 'no' or 'unclear'."]
+    experience_summary: Annotated[str, "One or two sentences summarizing the candidate's professional experience."]
+    reason_for_leaving: Annotated[str, "Short summary of why the candidate is leaving their current organization."]
+
+
+scoring_prompt = SystemMessage(content="""
+You extract structured facts from a completed candidate screening interview transcript.
+Use only what the candidate said. If something was not answered, use 'unclear' or an empty string.
+""")
+
+
+def _scripted_profile(messages):
+    """Rule-based CandidateProfile for the offline scripted provider."""
+    lines = str(messages[-1].content).splitlines()
+    answers = {}
+    for question, answer in zip(lines, lines[1:]):
+        if question.startswith("INTERVIEWER:") and answer.startswith("CANDIDATE:"):
+            answers[question.lower()] = answer.split(":", 1)[1].strip()
+
+    def answer_to(keyword):
+        return next((answer for question, answer in answers.items() if keyword in question), "")
+
+    def yes_no(text):
+        text = text.lower()
+        if text.startswith(("yes", "yeah", "sure")):
+            return "yes"
+        if text.startswith(("no", "not")):
+            return "no"
+        return "unclear"
+
+    return {
+        "open_to_relocation": yes_no(answer_to("relocat")),
+        "expected_compensation": answer_to("compensation"),
+        "has_led_team": yes_no(answer_to("led a team")),
+        "experience_summary": answer_to("experience"),
+        "reason_for_leaving": answer_to("leaving"),
+    }
+
+
+def get_scoring_llm():
+    llm = make_chat_model(
+        SCORING_PROVIDER,
+        model=SCORING_MODEL,
+        api_key=os.getenv("OPENAI_API_KEY"),
+        timeout=SCORING_TIMEOUT,
+        responders={"CandidateProfile": _scripted_profile},
+    )
+    return llm.with_structured_output(CandidateProfile, include_raw=True)
+
+
+def enqueue_transcript(interview_id, history, queue_dir=TRANSCRIPT_QUEUE_DIR):
+    """
+    Add a finished interview to the scoring queue.
+
+    Args:
+        interview_id (str): Unique id of the interview (e.g. its thread id).
+        history (list): Conversation entries with "role" and "content".
+        queue_dir (str): Queue directory.
+
+    Returns:
+        str: Path of the queued transcript.
+    """
+    os.makedirs(queue_dir, exist_ok=True)
+    path = os.path.join(queue_dir, f"{interview_id}.json")
+    record = {
+        "interview_id": interview_id,
+        "finished_at": time.time(),
+        "messages": [{"role": entry["role"], "content": entry["content"]} for entry in history],
+    }
+    # Write then rename so the batch job never reads a half-written file
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(record, f, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def _completed_ids(scores_path):
+    """Ids already present in the results file; used to resume after a crash."""
+    if not os.path.exists(scores_path):
+        return set()
+    done = set()
+    # Read bytes: a torn last line from a crash can end inside a multibyte character
+    with open(scores_path, "rb") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line.decode("utf-8", errors="replace"))["interview_id"])
+            except (ValueError, KeyError):
+                # The torn line itself; that interview is simply redone
+                continue
+    return done
+
+
+def _ends_with_torn_line(scores_path):
+    """True if the results file's last line was cut short by a crash."""
+    if not os.path.exists(scores_path):
+        return False
+    with open(scores_path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) != b"\n"
+
+
+def score_transcript(llm, transcript):
+    """
+    Extract a CandidateProfile from one transcript.
+
+    Returns:
+        dict: Result record with interview_id, profile and token usage.
+    """
+    text = "\n".join(
+        f"{'CANDIDATE' if message['role'] == 'user' else 'INTERVIEWER'}: {message['content']}"
+        for message in transcript["messages"]
+    )
+    response = scoring_policy.call(llm.invoke, [scoring_prompt, HumanMessage(content=text)])
+    if response.get("parsing_error"):
+        raise response["parsing_error"]
+    usage = getattr(response["raw"], "usage_metadata", None) or {}
+    return {
+        "interview_id": transcript["interview_id"],
+        "profile": response["parsed"],
+        "input_tokens": usage.get("input_tokens", 0),
+        "output_tokens": usage.get("output_tokens", 0),
+    }
+
+
+def run_batch(queue_dir=TRANSCRIPT_QUEUE_DIR, scores_path=SCORES_PATH, concurrency=SCORING_CONCURRENCY):
+    """
+    Score every queued transcript not yet in the results file.
+
+    Results are appended (and fsynced) one line per interview as they finish,
+    so a crashed run can simply be started again.
+
+    Returns:
+        dict: Report with scored/failed counts, throughput per hour and cost per interview.
+    """
+    os.makedirs(os.path.dirname(scores_path) or ".", exist_ok=True)
+    done = _completed_ids(scores_path)
+    pending = sorted(
+        os.path.join(queue_dir, name) for name in os.listdir(queue_dir)
+        if name.endswith(".json") and name[:-len(".json")] not in done
+    ) if os.path.isdir(queue_dir) else []
+
+    llm = get_scoring_llm()
+    scored, failed, input_tokens, output_tokens = 0, 0, 0, 0
+    started = time.monotonic()
+
+    def load_and_score(path):
+        with open(path, encoding="utf-8") as f:
+            return score_transcript(llm, json.load(f))
+
+    torn = _ends_with_torn_line(scores_path)
+    with open(scores_path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Terminate a torn line left by a crash before appending to it
+        if torn:
+            out.write("\n")
+        futures = {pool.submit(load_and_score, path): path for path in pending}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                metrics.incr("scoring.failed")
+                print(f"Failed to score {futures[future]}: {e}")
+                continue
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+            scored += 1
+            input_tokens += result["input_tokens"]
+            output_tokens += result["output_tokens"]
+
+    elapsed = time.monotonic() - started
+    cost = (input_tokens * SCORING_INPUT_PRICE + output_tokens * SCORING_OUTPUT_PRICE) / 1_000_000
+    return {
+        "scored": scored,
+        "failed": failed,
+        "skipped": len(done),
+        "elapsed_seconds": elapsed,
+        "interviews_per_hour": scored / elapsed * 3600 if elapsed and scored else 0.0,
+        "cost_per_interview_usd": cost / scored if scored else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score finished screening interviews in batch.")
+    parser.add_argument("--queue-dir", default=TRANSCRIPT_QUEUE_DIR)
+    parser.add_argument("--scores", default=SCORES_PATH)
+    parser.add_argument("--concurrency", type=int, default=SCORING_CONCURRENCY)
+    args = parser.parse_args()
+    print(json.dumps(run_batch(args.queue_dir, args.scores, args.concurrency), indent=2))
@@ -0,0 +1,55 @@
+import re
+
+# A sentence ends at . ! or ? followed by whitespace
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_sentences(text):
+    """
+    Split text into sentences.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        list: Non-empty, stripped sentences in order.
+    """
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text.strip()) if sentence.strip()]
+
+
+class SentenceBuffer:
+    """
+    Incrementally emit completed sentences from a growing piece of text,
+    e.g. a field being parsed out of an LLM token stream.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.emitted = 0
+
+    def update(self, text):
+        """
+        Replace the buffered text with a longer version of itself.
+
+        Args:
+            text (str): The full text received so far.
+
+        Returns:
+            list: Sentences that were completed since the last call.
+        """
+        self.text = text
+        completed = []
+        for match in _SENTENCE_BOUNDARY.finditer(text, self.emitted):
+            sentence = text[self.emitted:match.start()].strip()
+            if sentence:
+                completed.append(sentence)
+            self.emitted = match.end()
+        return completed
+
+    def flush(self):
+        """
+        Return the trailing sentence that has not been emitted yet, if any.
+        """
+        rest = self.text[self.emitted:].strip()
+        self.emitted = len(self.text)
+        return [rest] if rest else []
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# The app is a set of top-level modules; make them importable from the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Run against the offline scripted LLM and an in-process checkpointer
+os.environ.setdefault("SCREENING_LLM_PROVIDER", "scripted")
+os.environ.setdefault("SCRIPTED_LLM_LATENCY", "0.05")
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
@@ -0,0 +1,62 @@
+import gc
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import HumanMessage
+
+import agent
+
+TURNS = 3
+
+
+def _run_interview(index):
+    """Start one interview and answer a few questions with answers unique to it."""
+    session = agent.sessions.create()
+    agent.start_interview(session)
+    for turn in range(TURNS):
+        agent.process_with_agent(session, f"Candidate {index} answer {turn}")
+    return session
+
+
+def _answers(session):
+    messages = agent.get_graph().get_state(session.config).values["messages"]
+    return [message.content for message in messages if isinstance(message, HumanMessage)][1:]
+
+
+def _throughput(sessions):
+    """Turns per second with the given number of interviews running at once."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(_run_interview, range(sessions)))
+    return sessions * TURNS / (time.perf_counter() - started)
+
+
+def test_histories_stay_isolated():
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        sessions = list(pool.map(_run_interview, range(32)))
+
+    assert len({session.thread_id for session in sessions}) == 32
+    for index, session in enumerate(sessions):
+        assert _answers(session) == [f"Candidate {index} answer {turn}" for turn in range(TURNS)]
+
+
+def test_throughput_grows_with_session_count():
+    # Warm up the graph and the model so neither run pays for building them
+    _run_interview(-1)
+
+    single = _throughput(1)
+    many = _throughput(24)
+    # Turns mostly wait on the (simulated) LLM, so concurrent sessions overlap;
+    # graph bookkeeping still runs under the GIL, hence the margin
+    assert many > 4 * single
+
+
+def test_registry_forgets_dropped_sessions():
+    before = len(agent.sessions)
+    session = agent.sessions.create()
+    assert len(agent.sessions) == before + 1
+
+    # A closed tab simply drops its session; nothing has to call end()
+    del session
+    gc.collect()
+    assert len(agent.sessions) == before
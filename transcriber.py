@@ -1,43 +1,199 @@
-from openai import OpenAI
-import io
-from scipy.io.wavfile import write
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import os
 from dotenv import load_dotenv
+from asr_backends import make_asr_backend
+import metrics
 
 # Load environment variables
 load_dotenv()
 
-# Initialize OpenAI client
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
-openai_client = OpenAI(api_key=api_key)
+# "openai" for hosted Whisper, "local" for a CPU model loaded from LOCAL_ASR_MODEL_PATH
+ASR_BACKEND = os.getenv("ASR_BACKEND", "openai")
+
+# Preprocessing: Whisper works at 16 kHz mono, so anything more is wasted bandwidth
+ASR_SAMPLE_RATE = 16000
+SILENCE_DBFS = float(os.getenv("ASR_SILENCE_DBFS", "-45"))
+TRIM_PADDING = 0.2      # seconds of context kept around speech
+TARGET_PEAK = 0.89      # about -1 dBFS
+
+@functools.lru_cache(maxsize=1)
+def get_asr_backend():
+    """
+    Initialize the configured ASR backend on first use.
+    
+    Returns:
+        The shared backend (see asr_backends.make_asr_backend).
+    """
+    return make_asr_backend(ASR_BACKEND)
+
+def preprocess_audio(audio_data, fs):
+    """
+    Prepare recorded audio for upload: downmix to mono, resample to 16 kHz,
+    trim leading/trailing silence and normalize the level.
+    
+    Args:
+        audio_data (numpy.ndarray): int16 audio, shape (n,) or (n, channels).
+        fs (int): Sampling rate of audio_data.
+        
+    Returns:
+        numpy.ndarray: int16 mono audio at ASR_SAMPLE_RATE (empty if it was all silence).
+    """
+    from scipy.signal import resample_poly
+
+    samples = audio_data.astype(np.float32) / 32768.0
+    if samples.ndim == 2:
+        samples = samples.mean(axis=1)
+
+    if fs != ASR_SAMPLE_RATE:
+        divisor = np.gcd(fs, ASR_SAMPLE_RATE)
+        samples = resample_poly(samples, ASR_SAMPLE_RATE // divisor, fs // divisor)
+
+    # Frame-level RMS (20 ms frames) to find where speech starts and ends
+    frame = ASR_SAMPLE_RATE // 50
+    usable = len(samples) // frame * frame
+    if usable == 0:
+        return np.zeros(0, dtype=np.int16)
+    rms = np.sqrt(np.mean(samples[:usable].reshape(-1, frame) ** 2, axis=1))
+    voiced = np.flatnonzero(20 * np.log10(rms + 1e-10) > SILENCE_DBFS)
+    if voiced.size == 0:
+        return np.zeros(0, dtype=np.int16)
+    padding = int(TRIM_PADDING * ASR_SAMPLE_RATE)
+    start = max(0, voiced[0] * frame - padding)
+    end = min(len(samples), (voiced[-1] + 1) * frame + padding)
+    samples = samples[start:end]
+
+    peak = np.max(np.abs(samples))
+    if peak > 0:
+        samples = samples * (TARGET_PEAK / peak)
+    return (samples * 32767).astype(np.int16)
 
 def transcribe_audio(audio_data, fs):
     """
-    Transcribes audio data using OpenAI's Whisper model.
+    Transcribes audio data with the configured ASR backend.
     
     Args:
         audio_data (numpy.ndarray): Audio data as a numpy array.
         fs (int): Sampling rate.
         
     Returns:
-        str: The transcribed text.
-    """
-    # Convert to WAV in memory
-    audio_bytes = io.BytesIO()
-    write(audio_bytes, fs, audio_data)
-    audio_bytes.seek(0)
-    audio_bytes.name = "audio.wav"
-
-    try:
-        # Whisper transcription
-        transcription = openai_client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_bytes,
-            language="en"   # Force English transcription
-        )
-        return transcription.text
-    except Exception as e:
-        return f"Error during transcription: {e}"
+        str: The transcribed text (empty if the recording was silent).
+        
+    Raises:
+        Exception: If the backend fails (for hosted Whisper, after the ASR
+        call policy's retries or once its deadline is exceeded).
+    """
+    started = time.perf_counter()
+    samples = preprocess_audio(audio_data, fs)
+    if samples.size == 0:
+        return ""
+    metrics.record("asr.raw_bytes", audio_data.nbytes)
+    text = get_asr_backend().transcribe(samples, ASR_SAMPLE_RATE)
+    metrics.record("asr.end_to_end", time.perf_counter() - started)
+    return text
+
+def _words(text):
+    return [word.strip(".,!?;:\"'").lower() for word in text.split()]
+
+def stitch_transcripts(texts, max_overlap_words=8):
+    """
+    Join transcripts of consecutive overlapping segments, dropping words that
+    were transcribed twice because they fall inside the overlap.
+    
+    Args:
+        texts (list): Segment transcripts in order.
+        max_overlap_words (int): Longest run of repeated words to look for.
+        
+    Returns:
+        str: The combined transcript.
+    """
+    result = []
+    for text in texts:
+        words = text.split()
+        if result and words:
+            tail, head = _words(" ".join(result[-max_overlap_words:])), _words(" ".join(words[:max_overlap_words]))
+            for k in range(min(len(tail), len(head)), 0, -1):
+                if tail[-k:] == head[:k]:
+                    words = words[k:]
+                    break
+        result.extend(words)
+    return " ".join(result)
+
+class StreamingTranscriber:
+    """
+    Transcribes an answer while it is still being recorded.
+    
+    Incoming blocks are cut into segments at pauses (or at a maximum length),
+    each segment starting with a short overlap of the previous one, and each
+    segment is transcribed on a background thread. When recording stops only
+    the last segment remains, so the full transcript is ready almost at once.
+    """
+
+    def __init__(self, fs, min_segment=4.0, max_segment=12.0, overlap=0.5, pause=0.4, silence_rms=500):
+        self.fs = fs
+        self.min_samples = int(min_segment * fs)
+        self.max_samples = int(max_segment * fs)
+        self.overlap_samples = int(overlap * fs)
+        self.pause_samples = int(pause * fs)
+        self.silence_rms = silence_rms
+        self._blocks = []
+        self._samples = 0           # in the current segment, including the carried overlap
+        self._fresh_samples = 0     # fed since the last cut, i.e. not yet sent for transcription
+        self._silent_samples = 0
+        self._futures = []
+        self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="asr")
+
+    def feed(self, block):
+        """
+        Add one block of int16 audio. Cheap enough to call from the audio callback:
+        concatenation and upload happen on the worker thread.
+        
+        Args:
+            block (numpy.ndarray): The recorded block.
+        """
+        self._blocks.append(block)
+        self._samples += len(block)
+        self._fresh_samples += len(block)
+        rms = np.sqrt(np.mean(np.square(block, dtype=np.float32)))
+        self._silent_samples = self._silent_samples + len(block) if rms < self.silence_rms else 0
+
+        at_pause = self._samples >= self.min_samples and self._silent_samples >= self.pause_samples
+        if at_pause or self._samples >= self.max_samples:
+            self._cut()
+
+    def _cut(self):
+        blocks = self._blocks
+        self._futures.append(self._pool.submit(self._transcribe, blocks))
+
+        # Carry the tail of this segment into the next one as overlap
+        overlap, carried = [], 0
+        for block in reversed(blocks):
+            if carried >= self.overlap_samples:
+                break
+            overlap.insert(0, block)
+            carried += len(block)
+        self._blocks = overlap
+        self._samples = carried
+        self._fresh_samples = 0
+        self._silent_samples = 0
+
+    def _transcribe(self, blocks):
+        return transcribe_audio(np.concatenate(blocks, axis=0), self.fs)
+
+    def finish(self):
+        """
+        Transcribe whatever is left and stitch all segments together.
+        
+        Returns:
+            str: The full transcript.
+        """
+        started = time.perf_counter()
+        # The carried overlap alone has already been transcribed; only new audio needs a last segment
+        if self._fresh_samples > 0:
+            self._cut()
+        texts = [future.result() for future in self._futures]
+        self._pool.shutdown(wait=False)
+        metrics.record("asr.finish_latency", time.perf_counter() - started)
+        return stitch_transcripts(texts)
@@ -0,0 +1,142 @@
+import copy
+import functools
+import io
+import threading
+import time
+from datetime import datetime
+import metrics
+
+
+@functools.lru_cache(maxsize=1)
+def _styles():
+    """
+    Build the paragraph styles once per process.
+
+    Returns:
+        dict: ParagraphStyles by name ("title", "heading", "normal", "role").
+    """
+    # reportlab is only needed for exports, so keep it out of the startup path
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER
+
+    styles = getSampleStyleSheet()
+    return {
+        "title": ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=24,
+            textColor='#1f2937',
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        "heading": ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor='#374151',
+            spaceAfter=12,
+            spaceBefore=12
+        ),
+        "normal": ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=11,
+            textColor='#1f2937',
+            spaceAfter=8
+        ),
+        "role": ParagraphStyle(
+            'RoleStyle',
+            parent=styles['Normal'],
+            fontSize=12,
+            textColor='#0284c7',
+            fontName='Helvetica-Bold',
+            spaceAfter=4
+        ),
+    }
+
+
+def _turn_flowables(message):
+    """Flowables for one conversation entry."""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer
+
+    styles = _styles()
+    role = "CANDIDATE" if message["role"] == "user" else "INTERVIEWER"
+    # Escape special characters and preserve formatting
+    content = message['content'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+    return [
+        Paragraph(f"{role}:", styles["role"]),
+        Paragraph(content, styles["normal"]),
+        Spacer(1, 0.15*inch),
+    ]
+
+
+class TranscriptPDF:
+    """
+    PDF export of one interview's transcript.
+
+    The finished PDF is memoized on the history version, so repeated requests
+    for an unchanged conversation cost nothing. The conversation only ever
+    grows, so the flowables of turns already rendered are kept and only new
+    turns are parsed into paragraphs on the next build.
+    """
+
+    def __init__(self):
+        self._turns = []
+        self._version = None
+        self._pdf = None
+        self._lock = threading.Lock()
+
+    def build(self, history, version):
+        """
+        Return the transcript PDF for the given conversation.
+
+        Args:
+            history (list): Conversation entries with "role" and "content".
+            version (int): Changes whenever history changes.
+
+        Returns:
+            bytes: The PDF document.
+        """
+        with self._lock:
+            if version == self._version:
+                return self._pdf
+
+            from reportlab.lib.pagesizes import letter
+            from reportlab.lib.units import inch
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+            started = time.perf_counter()
+            if len(history) < len(self._turns):
+                # The conversation was cleared and restarted; nothing to reuse
+                self._turns = []
+            self._turns += [_turn_flowables(message) for message in history[len(self._turns):]]
+
+            styles = _styles()
+            buffer = io.BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=letter,
+                                  rightMargin=72, leftMargin=72,
+                                  topMargin=72, bottomMargin=18)
+
+            # Add title
+            elements = [Paragraph("SIGMOID AI CANDIDATE SCREENING", styles["title"]), Spacer(1, 0.2*inch)]
+
+            # Add interview details
+            elements.append(Paragraph("Interview Details", styles["heading"]))
+            elements.append(Paragraph(f"<b>Job Role:</b> Data Scientist", styles["normal"]))
+            elements.append(Paragraph(f"<b>Interview Type:</b> HR Screening", styles["normal"]))
+            elements.append(Paragraph(f"<b>Date:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles["normal"]))
+            elements.append(Spacer(1, 0.3*inch))
+
+            # Add conversation
+            elements.append(Paragraph("Conversation Transcript", styles["heading"]))
+            elements.append(Spacer(1, 0.2*inch))
+            for turn in self._turns:
+                # Layout leaves state on flowables (e.g. "postponed" marks), so each build
+                # lays out shallow copies; the parsed paragraph text is shared and reused
+                elements.extend(copy.copy(flowable) for flowable in turn)
+
+            doc.build(elements)
+            self._version, self._pdf = version, buffer.getvalue()
+            metrics.record("pdf.build_seconds", time.perf_counter() - started)
+            return self._pdf
@@ -1,17 +1,97 @@
 import asyncio
-from openai import AsyncOpenAI
-import tempfile
+import threading
 import os
 from dotenv import load_dotenv
+from resilience import CallPolicy
+import metrics
+from tts_cache import SpeechCache, speech_key
+from sentences import split_sentences
 
 # Load environment variables
 load_dotenv()
 
-# Initialize AsyncOpenAI client
-api_key = os.getenv("OPENAI_API_KEY")
-if not api_key:
-    raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
-client = AsyncOpenAI(api_key=api_key)
+TTS_TIMEOUT = float(os.getenv("TTS_TIMEOUT", "20"))
+tts_policy = CallPolicy("tts", timeout=TTS_TIMEOUT)
+
+# Voice configuration
+TTS_MODEL = os.getenv("TTS_MODEL", "gpt-4o-mini-tts")
+TTS_VOICE = os.getenv("TTS_VOICE", "coral")
+TTS_INSTRUCTIONS = os.getenv("TTS_INSTRUCTIONS", "Speak in a warm and friendly tone.")
+# Compressed formats are roughly a tenth the size of WAV, for both the cache and the page
+TTS_FORMAT = os.getenv("TTS_FORMAT", "mp3")  # "mp3", "opus", "aac", "flac" or "wav"
+
+# MIME type per response format
+AUDIO_FORMATS = {
+    "mp3": "audio/mpeg",
+    "opus": "audio/ogg",
+    "aac": "audio/aac",
+    "flac": "audio/flac",
+    "wav": "audio/wav",
+}
+if TTS_FORMAT not in AUDIO_FORMATS:
+    raise ValueError(f"Unknown TTS_FORMAT '{TTS_FORMAT}'. Use one of: {', '.join(AUDIO_FORMATS)}.")
+TTS_MIME_TYPE = AUDIO_FORMATS[TTS_FORMAT]
+# Read size for the response stream; a sentence of compressed audio is only a few of these
+TTS_STREAM_CHUNK = 64 * 1024
+
+# Synthesized audio is cached by content, since many replies repeat verbatim
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "tts_cache")
+TTS_CACHE_MEMORY_MB = float(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+TTS_CACHE_DISK_MB = float(os.getenv("TTS_CACHE_DISK_MB", "256"))
+speech_cache = SpeechCache(TTS_CACHE_DIR, int(TTS_CACHE_MEMORY_MB * 2**20), int(TTS_CACHE_DISK_MB * 2**20))
+
+# One event loop on a background thread runs all TTS requests for the process.
+# It owns the AsyncOpenAI client, so every session shares its warm connection pool.
+_loop = None
+_loop_lock = threading.Lock()
+_client = None
+# Synthesis in progress by cache key, so identical concurrent requests share one call.
+# Only touched on the TTS loop, so it needs no lock.
+_in_flight = {}
+
+def _get_loop():
+    """
+    Start the background TTS event loop on first use.
+    
+    Returns:
+        asyncio.AbstractEventLoop: The running loop.
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="tts-loop", daemon=True).start()
+                _loop = loop
+    return _loop
+
+def _get_client():
+    """
+    Initialize the AsyncOpenAI client on first use. Only called on the TTS loop.
+    
+    Returns:
+        AsyncOpenAI: The shared client.
+    """
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables. Please check your .env file.")
+        _client = AsyncOpenAI(api_key=api_key, timeout=TTS_TIMEOUT, max_retries=0)
+    return _client
+
+def submit(coro):
+    """
+    Run a coroutine on the background TTS loop. Safe to call from any thread.
+    
+    Args:
+        coro: The coroutine to run.
+        
+    Returns:
+        concurrent.futures.Future: Resolves to the coroutine's result.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
 
 async def _generate_speech(text):
     """
@@ -21,41 +101,122 @@ async def _generate_speech(text):
         text (str): The text to convert to speech.
         
     Returns:
-        str: Path to the temporary audio file.
+        memoryview: Read-only view of the encoded audio.
     """
-    # Create a temporary file for the audio
-    temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-    
-    # Generate speech
-    async with client.audio.speech.with_streaming_response.create(
-        model="gpt-4o-mini-tts",
-        voice="coral",
+    audio = bytearray()
+    async with _get_client().audio.speech.with_streaming_response.create(
+        model=TTS_MODEL,
+        voice=TTS_VOICE,
         input=text,
-        instructions="Speak in a warm and friendly tone.",
-        response_format="wav",
+        instructions=TTS_INSTRUCTIONS,
+        response_format=TTS_FORMAT,
     ) as response:
-        # Write the audio stream to the file
-        async for chunk in response.iter_bytes(chunk_size=1024):
-            temp_file.write(chunk)
+        async for chunk in response.iter_bytes(chunk_size=TTS_STREAM_CHUNK):
+            audio.extend(chunk)
+    # A view rather than bytes(audio), which would copy the whole clip once more
+    return memoryview(audio).toreadonly()
+
+async def _cached_speech(text):
+    """
+    Return the audio for text from the cache, synthesizing it on a miss.
     
-    temp_file.close()
-    return temp_file.name
+    Args:
+        text (str): The text to convert to speech.
+        
+    Returns:
+        bytes or memoryview: The encoded audio.
+    """
+    key = speech_key(text, TTS_MODEL, TTS_VOICE, TTS_INSTRUCTIONS, TTS_FORMAT)
+    audio = speech_cache.get(key)
+    if audio is not None:
+        return audio
+    if key not in _in_flight:
+        _in_flight[key] = asyncio.ensure_future(_synthesize_into_cache(key, text))
+        _in_flight[key].add_done_callback(lambda _: _in_flight.pop(key, None))
+    # Shielded so one caller giving up doesn't cancel the synthesis for the others
+    return await asyncio.shield(_in_flight[key])
+
+async def _synthesize_into_cache(key, text):
+    audio = await tts_policy.acall(_generate_speech, text)
+    speech_cache.put(key, audio)
+    return audio
+
+async def _speak(text):
+    audio = await _cached_speech(text)
+    metrics.record("tts.audio_bytes", len(audio))
+    return audio
+
+def submit_speech(text):
+    """
+    Start synthesizing text in the background.
+    
+    Args:
+        text (str): The text to convert to speech.
+        
+    Returns:
+        concurrent.futures.Future: Resolves to the encoded audio (bytes or
+        a read-only memoryview, in TTS_FORMAT), held in memory only.
+    """
+    return submit(_speak(text))
+
+def speak_sentences(text):
+    """
+    Synthesize text one sentence at a time, all sentences concurrently.
+    
+    Short sentences are cheap to synthesize, so the first one is ready long
+    before a whole multi-sentence reply would be; repeated sentences also hit
+    the speech cache on their own.
+    
+    Args:
+        text (str): The text to convert to speech.
+        
+    Returns:
+        list: Futures in playback order, each resolving to a segment's audio.
+    """
+    return [submit_speech(sentence) for sentence in split_sentences(text) or [text]]
 
 def text_to_speech(text):
     """
-    Convert text to speech and return the audio file path.
+    Convert text to speech.
     
     Args:
         text (str): The text to convert to speech.
         
     Returns:
-        str: Path to the audio file.
+        bytes or memoryview: The encoded audio, in TTS_FORMAT.
+    """
+    return submit_speech(text).result()
+
+def prewarm(texts):
+    """
+    Synthesize phrases into the cache in the background, e.g. at startup.
+    
+    Replies are spoken one sentence at a time (see speak_sentences), so each
+    text is split the same way and every distinct sentence is warmed.
+    
+    Args:
+        texts (list): Phrases to warm.
+        
+    Returns:
+        list: Futures, one per distinct sentence, resolving to the audio.
+    """
+    sentences = dict.fromkeys(sentence for text in texts for sentence in split_sentences(text) or [text])
+    return [submit(_cached_speech(sentence)) for sentence in sentences]
+
+def cache_stats():
+    """
+    Report the speech cache's hit rate and estimated synthesis time saved.
+    
+    Returns:
+        dict: See SpeechCache.stats.
     """
-    # Run the async function in a new event loop
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    return speech_cache.stats()
+
+def voice_fingerprint():
+    """
+    Identify the current voice settings, for invalidating cached audio.
     
-    return loop.run_until_complete(_generate_speech(text))
+    Returns:
+        tuple: (model, voice, instructions, format)
+    """
+    return (TTS_MODEL, TTS_VOICE, TTS_INSTRUCTIONS, TTS_FORMAT)
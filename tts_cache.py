@@ -0,0 +1,148 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+import metrics
+
+
+def speech_key(text, model, voice, instructions, fmt):
+    """
+    Content address of one synthesized utterance.
+
+    Returns:
+        str: Hex digest that changes whenever anything affecting the audio changes.
+    """
+    material = "\x1f".join([text, model, voice, instructions, fmt])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class SpeechCache:
+    """
+    Two-tier LRU cache of synthesized audio, keyed by speech_key.
+
+    The memory tier holds the most recently used clips up to memory_bytes.
+    The disk tier keeps up to disk_bytes of clips in a directory so they
+    survive restarts; its recency is the files' modification time, which is
+    refreshed on every hit.
+    """
+
+    def __init__(self, directory, memory_bytes, disk_bytes):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._lock = threading.Lock()
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        if disk_bytes > 0:
+            os.makedirs(directory, exist_ok=True)
+            entries = []
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if name.endswith(".tmp") or not os.path.isfile(path):
+                    continue
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, name, stat.st_size))
+            for _, name, size in sorted(entries):
+                self._disk[name] = size
+                self._disk_size += size
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    def _remember(self, key, data):
+        # Caller holds the lock
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key))
+        if len(data) > self.memory_bytes:
+            return
+        self._memory[key] = data
+        self._memory_size += len(data)
+        while self._memory_size > self.memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_size -= len(evicted)
+
+    def get(self, key):
+        """
+        Look up a clip.
+
+        Returns:
+            bytes: The audio, or None on a miss.
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                metrics.incr("tts_cache.memory_hits")
+                return self._memory[key]
+            on_disk = key in self._disk
+            if on_disk:
+                self._disk.move_to_end(key)
+        if not on_disk:
+            metrics.incr("tts_cache.misses")
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._path(key))
+        except OSError:
+            # Removed behind our back; treat as a miss
+            with self._lock:
+                self._disk_size -= self._disk.pop(key, 0)
+            metrics.incr("tts_cache.misses")
+            return None
+        with self._lock:
+            self._remember(key, data)
+        metrics.incr("tts_cache.disk_hits")
+        return data
+
+    def put(self, key, data):
+        """
+        Store a clip in both tiers, evicting the least recently used ones
+        beyond the size caps.
+        """
+        with self._lock:
+            self._remember(key, data)
+        if self.disk_bytes <= 0 or len(data) > self.disk_bytes:
+            return
+        # Write then rename so a concurrent reader never sees a partial clip
+        tmp = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+        evicted = []
+        with self._lock:
+            self._disk_size += len(data) - self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            while self._disk_size > self.disk_bytes:
+                name, size = self._disk.popitem(last=False)
+                self._disk_size -= size
+                evicted.append(name)
+        for name in evicted:
+            try:
+                os.remove(self._path(name))
+            except OSError:
+                pass
+
+    def stats(self):
+        """
+        Report hit rate and estimated synthesis time saved.
+
+        Returns:
+            dict: hits, misses, hit_rate, time_saved_seconds, memory_bytes, disk_bytes.
+        """
+        counters = metrics.summary()["counters"]
+        hits = counters.get("tts_cache.memory_hits", 0) + counters.get("tts_cache.disk_hits", 0)
+        misses = counters.get("tts_cache.misses", 0)
+        # Each hit saves roughly one typical synthesis call
+        typical = metrics.percentile("tts.latency", 50) or 0.0
+        with self._lock:
+            memory_size, disk_size = self._memory_size, self._disk_size
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "time_saved_seconds": hits * typical,
+            "memory_bytes": memory_size,
+            "disk_bytes": disk_size,
+        }
@@ -0,0 +1,76 @@
+import os
+import numpy as np
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Endpointing defaults, all in seconds except the threshold
+VAD_SILENCE_WINDOW = float(os.getenv("VAD_SILENCE_WINDOW", "1.2"))
+VAD_MIN_UTTERANCE = float(os.getenv("VAD_MIN_UTTERANCE", "0.6"))
+VAD_MAX_UTTERANCE = float(os.getenv("VAD_MAX_UTTERANCE", "90"))
+VAD_THRESHOLD_DBFS = float(os.getenv("VAD_THRESHOLD_DBFS", "-40"))
+
+
+class Endpointer:
+    """
+    Energy-based end-of-turn detector for a live int16 audio stream.
+
+    Each block fed in is classified as speech or silence by its RMS level.
+    The turn ends once the candidate has spoken for at least min_utterance
+    seconds and then stayed silent for silence_window seconds, or once
+    max_utterance seconds of audio have been captured. Silence before the
+    first speech never ends the turn, so a slow start is not cut off.
+
+    The work per block is one RMS over the block, so it is safe to call from
+    the audio callback.
+    """
+
+    def __init__(self, fs, silence_window=VAD_SILENCE_WINDOW, min_utterance=VAD_MIN_UTTERANCE,
+                 max_utterance=VAD_MAX_UTTERANCE, threshold_dbfs=VAD_THRESHOLD_DBFS):
+        self.fs = fs
+        self.silence_samples = int(silence_window * fs)
+        self.min_speech_samples = int(min_utterance * fs)
+        self.max_samples = int(max_utterance * fs)
+        # Compare mean squares against the squared threshold to skip the sqrt and log
+        self.threshold_ms = (32768.0 * 10 ** (threshold_dbfs / 20)) ** 2
+        self.samples = 0
+        self.speech_samples = 0
+        self.last_speech_end = None
+        self.ended = False
+        self.reason = None
+
+    def feed(self, block):
+        """
+        Classify one block of audio.
+
+        Args:
+            block (numpy.ndarray): int16 samples, shape (n,) or (n, channels).
+
+        Returns:
+            bool: True once the turn has ended (and on every call after that).
+        """
+        if self.ended:
+            return True
+        n = len(block)
+        self.samples += n
+        mean_square = np.mean(np.square(block, dtype=np.float32))
+        if mean_square >= self.threshold_ms:
+            self.speech_samples += n
+            self.last_speech_end = self.samples
+
+        if self.samples >= self.max_samples:
+            self.ended, self.reason = True, "max_utterance"
+        elif (self.last_speech_end is not None
+              and self.speech_samples >= self.min_speech_samples
+              and self.samples - self.last_speech_end >= self.silence_samples):
+            self.ended, self.reason = True, "silence"
+        return self.ended
+
+    def trailing_silence(self):
+        """
+        Seconds of audio captured after the candidate last spoke.
+        """
+        if self.last_speech_end is None:
+            return self.samples / self.fs
+        return (self.samples - self.last_speech_end) / self.fs